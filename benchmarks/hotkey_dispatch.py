@@ -0,0 +1,188 @@
+# benchmarks/hotkey_dispatch.py
+"""
+Despacho de callbacks de HotkeyManager: un hilo por pulsación (antes)
+frente a un único hilo despachador con cola (ahora).
+
+Sustituye la librería `keyboard` por un teclado simulado que dispara las
+hotkeys desde su propio hilo, como el hook real: pulsaciones sueltas de F1
+y F3/F4 mantenidas con autorrepetición y su liberación. Cada callback envía
+el comando por una conexión de multiprocessing, igual que hotkey_server.py.
+
+Mide, para cada modo:
+- latencia tecla → comando enviado (mediana, p95, máx)
+- hilos creados y máximo de hilos vivos a la vez
+- comandos enviados fuera del orden de las teclas
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.hotkey_dispatch [--holds 10] [--repeat-hz 30] [--hold-ms 600]
+"""
+import argparse
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from multiprocessing import Pipe
+
+from core.hotkeys import HotkeyManager
+
+
+class _FakeKeyboard:
+    """Lo justo de la API de `keyboard` que usa HotkeyManager."""
+
+    def __init__(self):
+        self._hotkeys = {}
+
+    def hook(self, callback, suppress=False):
+        pass
+
+    def unhook_all(self):
+        self._hotkeys.clear()
+
+    def add_hotkey(self, key, callback, suppress=False, trigger_on_release=False):
+        self._hotkeys[(key, trigger_on_release)] = callback
+
+    def fire(self, key, release=False):
+        self._hotkeys[(key, release)]()
+
+
+class _ThreadPerKeyManager(HotkeyManager):
+    """Comportamiento anterior: un hilo nuevo por cada pulsación/liberación."""
+
+    def _dispatch(self, callback):
+        threading.Thread(target=self._execute_callback, args=(callback,)).start()
+
+    def _start_dispatcher(self):
+        pass
+
+    def _stop_dispatcher(self):
+        pass
+
+
+class _ThreadCounter:
+    """Cuenta los Thread.start() mientras está activo."""
+
+    def __enter__(self):
+        self.started = 0
+        self._original = threading.Thread.start
+        counter = self
+
+        def counting_start(thread):
+            counter.started += 1
+            return counter._original(thread)
+
+        threading.Thread.start = counting_start
+        return self
+
+    def __exit__(self, *exc):
+        threading.Thread.start = self._original
+        return False
+
+
+def _script(holds, repeat_hz, hold_ms):
+    """Secuencia (tecla, liberación, comando, pausa_s) de una sesión de transcripción."""
+    repeats = max(1, int(hold_ms / 1000 * repeat_hz))
+    gap = 1.0 / repeat_hz
+    events = []
+    for i in range(holds):
+        events.append(("f1", False, "toggle_play_pause", 0.05))
+        key, command = ("f3", "seek_backward") if i % 2 == 0 else ("f4", "seek_forward")
+        for _ in range(repeats):
+            events.append((key, False, command, gap))
+        events.append((key, True, "stop_seek", 0.05))
+    return events
+
+
+def run_mode(manager_cls, events):
+    keyboard = _FakeKeyboard()
+    manager = manager_cls()
+    manager.keyboard = keyboard
+
+    reader, writer = Pipe(duplex=False)
+    send_lock = threading.Lock()
+    stamps = defaultdict(deque)     # comando → instantes de tecla pendientes
+    latencies = []
+    sent = []
+    received = []
+
+    def drain():
+        while True:
+            msg = reader.recv()
+            if msg is None:
+                return
+            received.append(msg)
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+
+    def send_command(command):
+        with send_lock:
+            writer.send({"command": command})
+            now = time.perf_counter()
+            latencies.append(now - stamps[command].popleft())
+            sent.append(command)
+
+    press = {
+        "f1": lambda: send_command("toggle_play_pause"),
+        "f3": lambda: send_command("seek_backward"),
+        "f4": lambda: send_command("seek_forward"),
+    }
+    release = {
+        "f3": lambda: send_command("stop_seek"),
+        "f4": lambda: send_command("stop_seek"),
+    }
+
+    with _ThreadCounter() as counter:
+        manager.start(press, release)
+        peak_threads = threading.active_count()
+        expected = []
+        for key, is_release, command, pause in events:
+            with send_lock:
+                stamps[command].append(time.perf_counter())
+            expected.append(command)
+            keyboard.fire(key, is_release)
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(pause)
+
+        deadline = time.perf_counter() + 5.0
+        while len(sent) < len(expected) and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        manager.stop()
+        threads_started = counter.started
+
+    writer.send(None)
+    drainer.join(timeout=2.0)
+
+    out_of_order = sum(1 for got, want in zip(sent, expected) if got != want)
+    return {
+        "latencies_ms": sorted(s * 1000 for s in latencies),
+        "threads": threads_started,
+        "peak_threads": peak_threads,
+        "out_of_order": out_of_order,
+        "sent": len(sent),
+        "expected": len(expected),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holds", type=int, default=10, help="veces que se mantiene F3/F4")
+    parser.add_argument("--repeat-hz", type=float, default=30.0, help="autorrepetición del teclado")
+    parser.add_argument("--hold-ms", type=float, default=600.0, help="duración de cada pulsación mantenida")
+    args = parser.parse_args()
+
+    events = _script(args.holds, args.repeat_hz, args.hold_ms)
+    print(f"{len(events)} eventos de teclado (autorrepetición a {args.repeat_hz:.0f} Hz)")
+    print(f"{'modo':<18} {'mediana':>8} {'p95':>8} {'máx':>8}   (ms)  {'hilos':>6} {'pico':>5} {'desorden':>9}")
+    for name, cls in (("hilo por tecla", _ThreadPerKeyManager), ("despachador", HotkeyManager)):
+        result = run_mode(cls, events)
+        ms = result["latencies_ms"]
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        print(
+            f"{name:<18} {statistics.median(ms):8.3f} {p95:8.3f} {ms[-1]:8.3f}        "
+            f"{result['threads']:6d} {result['peak_threads']:5d} {result['out_of_order']:9d}"
+            + ("" if result["sent"] == result["expected"] else f"  ({result['sent']}/{result['expected']} enviados)")
+        )
+
+
+if __name__ == "__main__":
+    main()
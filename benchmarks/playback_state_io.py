@@ -0,0 +1,127 @@
+# benchmarks/playback_state_io.py
+"""
+Bloqueo del hilo llamante (el de Tk) en PlaybackState con un disco lento.
+
+Se envuelve el almacén para que cada lectura y escritura tarde --write-delay
+ms y se mide cuánto tardan save_position / clear / get_position en volver
+mientras el hilo escritor está ocupado. Cada get_position sigue a un
+save_position del mismo archivo y debe devolver esa posición. Termina con
+código 1 si alguna llamada supera --max-block ms o devuelve una posición
+atrasada.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.playback_state_io [--calls 2000] [--write-delay 250] [--max-block 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import core.playback_state as playback_state
+from core.playback_state import PlaybackState
+
+
+class _SlowStore:
+    """Envuelve un PlaybackStore y retrasa cada acceso (disco lento, unidad de red)."""
+
+    def __init__(self, store, delay_s):
+        self._store = store
+        self._delay_s = delay_s
+        self.writes = 0
+
+    def write(self, changes):
+        time.sleep(self._delay_s)
+        self.writes += 1
+        self._store.write(changes)
+
+    def replace_all(self, state):
+        time.sleep(self._delay_s)
+        self._store.replace_all(state)
+
+    def get(self, path):
+        time.sleep(self._delay_s)
+        return self._store.get(path)
+
+    def load(self):
+        time.sleep(self._delay_s)
+        return self._store.load()
+
+    def __getattr__(self, name):
+        return getattr(self._store, name)
+
+
+def _timed(samples, fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    samples.append((time.perf_counter() - t0) * 1000)
+    return result
+
+
+def run(calls, write_delay_ms, max_block_ms, backend):
+    folder = tempfile.mkdtemp(prefix="playback_state_io_")
+    playback_state.STATE_FILE_PATH = os.path.join(folder, "config", "playback_state.json")
+    playback_state.STATE_DB_PATH = os.path.join(folder, "config", "playback_state.sqlite3")
+    playback_state.FLUSH_INTERVAL_S = 0.05   # Volcados frecuentes: el escritor casi siempre ocupado
+
+    files = []
+    for i in range(50):
+        path = os.path.join(folder, f"grabacion_{i:02d}.wav")
+        with open(path, "wb") as f:
+            f.write(os.urandom(256 * 1024))
+        files.append(path)
+
+    state = PlaybackState(backend=backend, prune_on_start=False)
+    slow = _SlowStore(state._store, write_delay_ms / 1000)
+    state._store = slow
+
+    save, clear, get = [], [], []
+    stale = 0
+    for i in range(calls):
+        path = files[i % len(files)]
+        _timed(save, state.save_position, path, 1000 + i, 600000)
+        expected = 1000 + i
+        if i % 50 == 49:
+            _timed(clear, state.clear, path)
+            expected = None
+        if _timed(get, state.get_position, path) != expected:
+            stale += 1
+        time.sleep(0.0005)
+
+    t0 = time.perf_counter()
+    flushed = state.flush()
+    flush_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"PlaybackState ({backend}), {calls} guardados, escritura simulada de {write_delay_ms} ms")
+    print(f"{'llamada':<14} {'mediana':>9} {'p99':>9} {'máx':>9}   (ms)")
+    for name, ms in (("save_position", save), ("clear", clear), ("get_position", get)):
+        ms = sorted(ms)
+        p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+        print(f"{name:<14} {statistics.median(ms):9.3f} {p99:9.3f} {ms[-1]:9.3f}")
+    print(f"escrituras al almacén: {slow.writes}, descartadas por cola llena: {state.dropped_writes}")
+    print(f"lecturas atrasadas tras guardar: {stale}")
+    print(f"flush final: {flush_ms:.1f} ms ({'completo' if flushed else 'TIEMPO AGOTADO'})")
+
+    worst = max(max(save), max(clear), max(get))
+    if worst > max_block_ms or not flushed:
+        print(f"FALLO: el hilo llamante se bloqueó {worst:.1f} ms (límite {max_block_ms} ms)")
+        return 1
+    if stale:
+        print(f"FALLO: {stale} lecturas no devolvieron la posición recién guardada")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--write-delay", type=float, default=250.0, help="ms por escritura al almacén")
+    parser.add_argument("--max-block", type=float, default=5.0, help="ms máximos por llamada de escritura")
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal")
+    args = parser.parse_args()
+    sys.exit(run(args.calls, args.write_delay, args.max_block, args.backend))
+
+
+if __name__ == "__main__":
+    main()
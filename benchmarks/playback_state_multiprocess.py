@@ -0,0 +1,117 @@
+# benchmarks/playback_state_multiprocess.py
+"""
+Prueba de estrés de PlaybackState con varios procesos escribiendo a la vez
+sobre los mismos archivos (como dos instancias de la UI).
+
+Cada proceso guarda la posición de sus propios archivos varias veces y,
+además, la de unos archivos compartidos por todos. Con volcados muy
+frecuentes y una compactación cada pocos registros, se fuerza que
+escrituras, rotaciones y snapshots de distintos procesos se crucen.
+
+Al final se abre el almacén desde cero y se comprueba que no falta ninguna
+entrada y que cada una tiene la última posición guardada. Termina con
+código 1 si algo se perdió.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.playback_state_multiprocess [--procs 6] [--files 200] [--backend journal]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import core.playback_state as playback_state
+import core.playback_store as playback_store
+
+SAVES_PER_FILE = 3
+SHARED_FILES = 10
+DURATION_MS = 3600000
+
+
+def _configure(folder):
+    playback_state.STATE_FILE_PATH = os.path.join(folder, "config", "playback_state.json")
+    playback_state.STATE_DB_PATH = os.path.join(folder, "config", "playback_state.sqlite3")
+    playback_state.FLUSH_INTERVAL_S = 0.005
+    playback_store.COMPACT_AFTER_RECORDS = 40
+
+
+def _own_path(proc, index):
+    return os.path.join(os.sep, "estres", f"proceso_{proc}", f"grabacion_{index:04d}.wav")
+
+
+def _shared_path(index):
+    return os.path.join(os.sep, "estres", "compartido", f"caso_{index}.wav")
+
+
+def _worker(folder, backend, proc, files):
+    _configure(folder)
+    state = playback_state.PlaybackState(backend=backend, prune_on_start=False)
+    for round_ in range(SAVES_PER_FILE):
+        for index in range(files):
+            state.save_position(_own_path(proc, index), 1000 * (round_ + 1) + index, DURATION_MS)
+            if index % 20 == 0:
+                state.save_position(_shared_path(index % SHARED_FILES), 1000 + proc, DURATION_MS)
+            time.sleep(0.0002)
+    if not state.flush(timeout=60):
+        sys.exit(2)
+
+
+def run(procs, files, backend):
+    folder = tempfile.mkdtemp(prefix="playback_state_mp_")
+    _configure(folder)
+
+    t0 = time.perf_counter()
+    workers = [
+        multiprocessing.Process(target=_worker, args=(folder, backend, proc, files))
+        for proc in range(procs)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - t0
+
+    store = playback_store.open_store(backend, playback_state.STATE_FILE_PATH, playback_state.STATE_DB_PATH)
+    saved = store.load()
+    store.close()
+
+    def entry_for(path):
+        return saved.get(os.path.normcase(os.path.abspath(path)))
+
+    missing, stale = [], []
+    for proc in range(procs):
+        for index in range(files):
+            path = _own_path(proc, index)
+            entry = entry_for(path)
+            if entry is None:
+                missing.append(path)
+            elif entry.position_ms != 1000 * SAVES_PER_FILE + index:
+                stale.append(path)
+    shared_written = {index % SHARED_FILES for index in range(0, files, 20)}
+    missing += [_shared_path(i) for i in sorted(shared_written) if entry_for(_shared_path(i)) is None]
+
+    failed_workers = [w.exitcode for w in workers if w.exitcode != 0]
+    expected = procs * files + len(shared_written)
+    print(f"PlaybackState ({backend}): {procs} procesos x {files} archivos x {SAVES_PER_FILE} guardados en {elapsed:.1f} s")
+    print(f"entradas esperadas: {expected}, en el almacén: {len(saved)}")
+    print(f"perdidas: {len(missing)}, con posición atrasada: {len(stale)}, procesos fallidos: {len(failed_workers)}")
+    for path in (missing + stale)[:10]:
+        print(f"  {path}")
+
+    return 1 if missing or stale or failed_workers else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--procs", type=int, default=6)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal")
+    args = parser.parse_args()
+    sys.exit(run(args.procs, args.files, args.backend))
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    main()
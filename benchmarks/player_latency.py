@@ -0,0 +1,170 @@
+# benchmarks/player_latency.py
+"""
+Latencia orden → efecto de Player sobre el backend simulado (core.fake_vlc),
+sin audio ni pantalla: load, seek, pause y fin de archivo.
+
+Cada latencia incluye el retardo simulado del backend (columna "simulado");
+la diferencia es el coste propio de Player (cola, hilo, eventos).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.player_latency [--runs 20] [--prefetch]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from core.fake_vlc import FakeVlc
+from core.player import Player, PlayerState
+
+LENGTH_MS = 60000
+TIMEOUT_S = 5.0
+# Análisis lento (red, archivo grande) para cambiar al precargado a medio analizar
+SLOW_PARSE_MS = 300
+
+
+class _Recorder:
+    """
+    Sustituye a la raíz de Tk: ejecuta los callbacks en el acto (en el hilo
+    del player) y guarda cada estado y tiempo con su marca perf_counter.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._events = []   # (instante, tipo, valor)
+
+    def after_idle(self, fn, *args):
+        fn(*args)
+
+    def record(self, kind, value):
+        with self._cond:
+            self._events.append((time.perf_counter(), kind, value))
+            self._cond.notify_all()
+
+    def wait_for(self, kind, predicate, since):
+        """Instante del primer evento `kind` posterior a `since` que cumple `predicate`."""
+        deadline = time.perf_counter() + TIMEOUT_S
+        with self._cond:
+            while True:
+                for stamp, event_kind, value in self._events:
+                    if stamp >= since and event_kind == kind and predicate(value):
+                        return stamp
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError(f"Sin evento '{kind}' tras {TIMEOUT_S} s")
+                self._cond.wait(remaining)
+
+
+class _MemoryState:
+    """PlaybackState en memoria (no toca config/playback_state.json)."""
+
+    has_video = False
+
+    def __init__(self):
+        self._positions = {}
+
+    def get_position(self, path, timeout=None):
+        return self._positions.get(path)
+
+    def save_position(self, path, position_ms, duration_ms=None):
+        self._positions[path] = position_ms
+
+    def flush(self):
+        pass
+
+
+def _state_is(state):
+    return lambda value: value == state
+
+
+def run(runs, prefetch):
+    backend = FakeVlc(default_length_ms=LENGTH_MS)
+    recorder = _Recorder()
+    player = Player(
+        recorder, _MemoryState(),
+        on_state_change=lambda state: recorder.record("state", state),
+        on_time_changed=lambda cur, total, sampled_at: recorder.record("time", cur),
+        prefetch_next=prefetch,
+        backend=backend,
+    )
+
+    folder = tempfile.mkdtemp(prefix="player_latency_")
+    files = []
+    for i in range(runs + 1):
+        path = os.path.join(folder, f"grabacion_{i:03d}.wav")
+        open(path, "wb").close()
+        files.append(path)
+
+    results = {"load": [], "seek": [], "pause": [], "fin de archivo": []}
+    load_delay_ms = max(backend.parse_delay_ms, backend.start_delay_ms)
+    try:
+        for i in range(runs):
+            # load → PAUSED
+            t0 = time.perf_counter()
+            player.load_media(files[i])
+            results["load"].append(recorder.wait_for("state", _state_is(PlayerState.PAUSED), t0) - t0)
+
+            t0 = time.perf_counter()
+            player.play()
+            recorder.wait_for("state", _state_is(PlayerState.PLAYING), t0)
+
+            # seek → primer aviso de tiempo en el destino
+            target_ms = LENGTH_MS * (0.2 + 0.6 * i / runs)
+            t0 = time.perf_counter()
+            player.set_position(target_ms / LENGTH_MS)
+            results["seek"].append(recorder.wait_for("time", lambda cur: abs(cur - target_ms) < 250, t0) - t0)
+
+            # pause → PAUSED
+            t0 = time.perf_counter()
+            player.pause()
+            results["pause"].append(recorder.wait_for("state", _state_is(PlayerState.PAUSED), t0) - t0)
+
+            # Fin de archivo: desde el EndReached del backend hasta FINISHED
+            player.set_position((LENGTH_MS - 300) / LENGTH_MS)
+            t0 = time.perf_counter()
+            player.play()
+            finished = recorder.wait_for("state", _state_is(PlayerState.FINISHED), t0)
+            results["fin de archivo"].append(finished - player.media_player.ended_at)
+
+        if prefetch:
+            # Siguiente (Ctrl+N) justo después de cargar, con la precarga aún
+            # analizándose: debe terminar en PAUSED cuando acabe el análisis
+            results["siguiente sin analizar"] = []
+            backend.parse_delay_ms = SLOW_PARSE_MS
+            for i in range(min(runs, 5)):
+                t0 = time.perf_counter()
+                player.load_media(files[i])
+                recorder.wait_for("state", _state_is(PlayerState.PAUSED), t0)
+                t0 = time.perf_counter()
+                player.load_next()
+                results["siguiente sin analizar"].append(recorder.wait_for("state", _state_is(PlayerState.PAUSED), t0) - t0)
+    finally:
+        player.release()
+
+    simulated = {
+        "load": load_delay_ms,
+        "seek": backend.seek_delay_ms,
+        "pause": 0.0,
+        "fin de archivo": 0.0,
+        "siguiente sin analizar": SLOW_PARSE_MS,
+    }
+    print(f"Player + FakeVlc, {runs} repeticiones{' (con precarga)' if prefetch else ''}")
+    print(f"{'operación':<22} {'mediana':>9} {'p95':>9} {'máx':>9} {'simulado':>9}   (ms)")
+    for name, samples in results.items():
+        ms = sorted(s * 1000 for s in samples)
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        print(f"{name:<22} {statistics.median(ms):9.1f} {p95:9.1f} {ms[-1]:9.1f} {simulated[name]:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--prefetch", action="store_true", help="precargar el siguiente archivo de la carpeta")
+    args = parser.parse_args()
+    run(args.runs, args.prefetch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/waveform_alloc.py
+"""
+Mide la memoria asignada por frame en WaveformSimulator.get_window y
+WaveformPeaks.get_window durante una reproducción simulada en régimen estable.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.waveform_alloc
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.waveform_peaks import WaveformPeaks, build_pyramid
+from core.waveform_simulator import WaveformSimulator
+
+WIDTH = 1500
+FRAMES = 2000
+WARMUP = 50
+
+
+def _ready_peaks(duration_s=3600):
+    """WaveformPeaks con una pirámide sintética de `duration_s` segundos."""
+    rng = np.random.default_rng(0)
+    base = rng.uniform(-1.0, 1.0, (duration_s * 125, 3)).astype(np.float32)
+
+    peaks = WaveformPeaks()
+    peaks.set_pyramid(build_pyramid(base))
+    return peaks
+
+
+def measure(name, get_window):
+    for frame in range(WARMUP):
+        get_window(frame / FRAMES)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    started = time.perf_counter()
+    for frame in range(FRAMES):
+        get_window(frame / FRAMES)
+    elapsed = time.perf_counter() - started
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<34} {elapsed / FRAMES * 1e6:8.1f} µs/frame   "
+        f"retenido {current - baseline:6d} B   pico {peak - baseline:6d} B"
+    )
+    return current - baseline
+
+
+def main():
+    print(f"get_window({WIDTH} columnas) x {FRAMES} frames")
+
+    simulator = WaveformSimulator()
+    measure("WaveformSimulator", lambda pos: simulator.get_window(pos, WIDTH))
+
+    peaks = _ready_peaks()
+    for spp in (256, 700, 4096):
+        measure(f"WaveformPeaks (zoom {spp} spp)", lambda pos: peaks.get_window(pos, WIDTH, samples_per_pixel=spp))
+
+
+if __name__ == "__main__":
+    main()
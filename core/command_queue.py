@@ -0,0 +1,80 @@
+# core/command_queue.py
+import queue
+import threading
+from collections import deque
+
+# Comandos idempotentes: solo importa el último valor. Dentro de un mismo
+# tramo entre barreras (play/pause/stop/load...) se colapsan al más reciente.
+COALESCED_ACTIONS = frozenset({
+    "set_position",
+    "set_volume",
+    "set_gain",
+    "set_drawable",
+    "vlc_time",
+    "vlc_length",
+})
+
+
+class CommandQueue:
+    """
+    Cola FIFO de (acción, payload) con colapso "último gana".
+
+    Un comando de COALESCED_ACTIONS sustituye al pendiente de la misma
+    acción siempre que no haya una barrera (cualquier otro comando) entre
+    ambos, así que el orden respecto a play/pause/stop/load se conserva.
+
+    Misma interfaz básica que queue.Queue (put / get / qsize).
+    """
+
+    def __init__(self):
+        self._items = deque()
+        self._cond = threading.Condition()
+
+        # Métricas
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.dropped_by_action = {}
+
+    def put(self, item):
+        action = item[0]
+        with self._cond:
+            if action in COALESCED_ACTIONS:
+                self._drop_pending(action)
+            self._items.append(item)
+            self.enqueued += 1
+            if len(self._items) > self.max_depth:
+                self.max_depth = len(self._items)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Bloquea hasta que haya un comando; queue.Empty si vence `timeout`."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "max_depth": self.max_depth,
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "dropped_by_action": dict(self.dropped_by_action),
+            }
+
+    def _drop_pending(self, action):
+        """Quita el pendiente de `action` posterior a la última barrera."""
+        for i in range(len(self._items) - 1, -1, -1):
+            pending = self._items[i][0]
+            if pending == action:
+                del self._items[i]
+                self.dropped += 1
+                self.dropped_by_action[action] = self.dropped_by_action.get(action, 0) + 1
+                return
+            if pending not in COALESCED_ACTIONS:
+                return  # Barrera: no colapsar a través de ella
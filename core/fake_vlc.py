@@ -0,0 +1,459 @@
+# core/fake_vlc.py
+"""
+Backend de reproducción simulado con la interfaz de python-vlc que usa Player.
+
+Sin audio, sin pantalla y sin libVLC: un reloj virtual y un planificador
+propio emiten los mismos eventos (Playing, TimeChanged, EndReached...) desde
+un hilo aparte, como hace libVLC. Los retardos de análisis, arranque y
+salto son configurables, de modo que los tiempos de Player se pueden medir
+y comparar entre versiones en cualquier máquina.
+
+    backend = FakeVlc(parse_delay_ms=40, seek_delay_ms=20)
+    player = Player(root, state, backend=backend)
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from enum import Enum, auto
+from types import SimpleNamespace
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".wmv", ".webm")
+
+
+# ---------------------------------------------------------
+# ENUMS (mismos nombres que python-vlc)
+# ---------------------------------------------------------
+
+class EventType(Enum):
+    MediaPlayerTimeChanged = auto()
+    MediaPlayerLengthChanged = auto()
+    MediaPlayerEndReached = auto()
+    MediaPlayerEncounteredError = auto()
+    MediaPlayerPlaying = auto()
+    MediaPlayerPaused = auto()
+    MediaPlayerStopped = auto()
+    MediaPlayerVout = auto()
+    MediaPlayerSeekableChanged = auto()
+    MediaParsedChanged = auto()
+
+
+class State(Enum):
+    NothingSpecial = auto()
+    Opening = auto()
+    Playing = auto()
+    Paused = auto()
+    Stopped = auto()
+    Ended = auto()
+    Error = auto()
+
+
+class TrackType(Enum):
+    audio = auto()
+    video = auto()
+
+
+class MediaParseFlag(Enum):
+    local = auto()
+    network = auto()
+
+
+class MediaParsedStatus(Enum):
+    skipped = auto()
+    failed = auto()
+    timeout = auto()
+    done = auto()
+
+
+# ---------------------------------------------------------
+# RELOJ VIRTUAL Y PLANIFICADOR
+# ---------------------------------------------------------
+
+class VirtualClock:
+    """Milisegundos virtuales: el tiempo real multiplicado por `speed`."""
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now_ms(self) -> float:
+        return (time.monotonic() - self._origin) * 1000.0 * self.speed
+
+
+class _Scheduler:
+    """
+    Ejecuta callbacks en instantes del reloj virtual desde un único hilo.
+    Orden determinista: por instante y, a igualdad, por orden de programación.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def call_later(self, delay_ms: float, fn, *args):
+        with self._cond:
+            heapq.heappush(self._heap, (self.clock.now_ms() + max(0.0, delay_ms), next(self._seq), fn, args))
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._heap:
+                        wait_ms = self._heap[0][0] - self.clock.now_ms()
+                        if wait_ms <= 0:
+                            _, _, fn, args = heapq.heappop(self._heap)
+                            break
+                        self._cond.wait(wait_ms / 1000.0 / self.clock.speed)
+                    else:
+                        self._cond.wait()
+            fn(*args)
+
+
+# ---------------------------------------------------------
+# EVENTOS
+# ---------------------------------------------------------
+
+class _EventManager:
+    def __init__(self):
+        self._callbacks = {}
+
+    def event_attach(self, event_type, callback, *args):
+        self._callbacks.setdefault(event_type, []).append((callback, args))
+        return 0
+
+    def event_detach(self, event_type):
+        self._callbacks.pop(event_type, None)
+
+    def emit(self, event_type, **u):
+        event = SimpleNamespace(type=event_type, u=SimpleNamespace(**u))
+        for callback, args in list(self._callbacks.get(event_type, ())):
+            callback(event, *args)
+
+
+# ---------------------------------------------------------
+# BACKEND
+# ---------------------------------------------------------
+
+class FakeVlc:
+    """
+    Sustituto de `import vlc` para Player. Los retardos están en ms virtuales.
+
+    media_info(path) -> (duración_ms, tiene_video) permite describir cada
+    archivo; por defecto todos duran `default_length_ms` y son video según
+    la extensión.
+    """
+
+    EventType = EventType
+    State = State
+    TrackType = TrackType
+    MediaParseFlag = MediaParseFlag
+    MediaParsedStatus = MediaParsedStatus
+
+    def __init__(self, parse_delay_ms=30.0, start_delay_ms=40.0, seek_delay_ms=15.0,
+                 pause_delay_ms=5.0, time_tick_ms=100.0, default_length_ms=60000,
+                 speed=1.0, media_info=None):
+        self.parse_delay_ms = parse_delay_ms
+        self.start_delay_ms = start_delay_ms
+        self.seek_delay_ms = seek_delay_ms
+        self.pause_delay_ms = pause_delay_ms
+        self.time_tick_ms = time_tick_ms
+        self.default_length_ms = default_length_ms
+        self.media_info = media_info or self._default_media_info
+
+        self.clock = VirtualClock(speed)
+        self.scheduler = _Scheduler(self.clock)
+
+    def Instance(self, args=None):
+        return _Instance(self)
+
+    def _default_media_info(self, path):
+        return self.default_length_ms, path.lower().endswith(VIDEO_EXTENSIONS)
+
+
+class _Instance:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def media_new(self, mrl):
+        return _Media(self._backend, mrl)
+
+    def media_player_new(self):
+        return _MediaPlayer(self._backend)
+
+    def release(self):
+        pass
+
+
+class _Media:
+    def __init__(self, backend, mrl):
+        self._backend = backend
+        self.mrl = mrl
+        parsed = urlparse(mrl)
+        self.path = url2pathname(unquote(parsed.path)) if parsed.scheme == "file" else mrl
+        self.length_ms, self.has_video = backend.media_info(self.path)
+        self.options = []
+        self._events = _EventManager()
+        self._status = None
+        self._parse_generation = 0
+
+    def event_manager(self):
+        return self._events
+
+    def add_option(self, option):
+        self.options.append(option)
+
+    def parse_with_options(self, flags, timeout_ms):
+        self._parse_generation += 1
+        generation = self._parse_generation
+        delay = self._backend.parse_delay_ms
+        if not os.path.exists(self.path):
+            status = MediaParsedStatus.failed
+        elif timeout_ms > 0 and delay > timeout_ms:
+            status, delay = MediaParsedStatus.timeout, timeout_ms
+        else:
+            status = MediaParsedStatus.done
+        self._backend.scheduler.call_later(delay, self._finish_parse, generation, status)
+        return 0
+
+    def parse_stop(self):
+        self._parse_generation += 1
+
+    def get_parsed_status(self):
+        return self._status
+
+    def tracks_get(self):
+        if self._status != MediaParsedStatus.done:
+            return []
+        tracks = [SimpleNamespace(type=TrackType.audio)]
+        if self.has_video:
+            tracks.append(SimpleNamespace(type=TrackType.video))
+        return tracks
+
+    def _finish_parse(self, generation, status):
+        if generation != self._parse_generation:
+            return  # Cancelado
+        self._status = status
+        self._events.emit(EventType.MediaParsedChanged, new_status=status)
+
+
+class _MediaPlayer:
+    """
+    Reproductor simulado. El tiempo de reproducción se deriva del reloj
+    virtual; cada cambio (play, pausa, salto, stop) invalida lo programado
+    incrementando `_generation`.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._lock = threading.RLock()
+        self._events = _EventManager()
+        self._media = None
+        self._state = State.NothingSpecial
+        self._generation = 0
+        self._base_ms = 0          # Tiempo de medio en `_anchor_ms`
+        self._anchor_ms = 0.0      # Instante virtual del último ancla
+        self._seekable = False
+        self._started = False
+        self._volume = 100
+        self._muted = False
+        self._hwnd = None
+        self.ended_at = None       # time.perf_counter() del último EndReached (métricas)
+
+    # --- Consultas ---
+
+    def event_manager(self):
+        return self._events
+
+    def get_media(self):
+        return self._media
+
+    def get_state(self):
+        return self._state
+
+    def get_length(self):
+        return self._media.length_ms if self._media is not None and self._started else 0
+
+    def is_seekable(self):
+        return self._seekable
+
+    def get_time(self):
+        with self._lock:
+            if self._media is None:
+                return -1
+            if self._state != State.Playing:
+                return int(self._base_ms)
+            elapsed = self._backend.clock.now_ms() - self._anchor_ms
+            return int(min(self._media.length_ms, self._base_ms + elapsed))
+
+    def get_position(self):
+        length = self.get_length()
+        return self.get_time() / length if length > 0 else 0.0
+
+    def audio_get_volume(self):
+        return self._volume
+
+    # --- Configuración ---
+
+    def set_media(self, media):
+        with self._lock:
+            self._invalidate()
+            self._media = media
+            self._state = State.NothingSpecial
+            self._base_ms = 0
+            self._seekable = False
+            self._started = False
+
+    def set_hwnd(self, hwnd):
+        self._hwnd = hwnd
+
+    def audio_set_volume(self, volume):
+        self._volume = volume
+        return 0
+
+    def audio_set_mute(self, muted):
+        self._muted = bool(muted)
+
+    # --- Transporte ---
+
+    def play(self):
+        with self._lock:
+            if self._media is None:
+                return -1
+            if self._state == State.Playing:
+                return 0
+            generation = self._invalidate()
+            if self._state == State.Paused:
+                delay = self._backend.pause_delay_ms
+            else:
+                self._state = State.Opening
+                delay = 0 if self._started else self._backend.start_delay_ms
+        self._backend.scheduler.call_later(delay, self._on_started, generation)
+        return 0
+
+    def pause(self):
+        with self._lock:
+            playing = self._state == State.Playing
+        if playing:
+            self.set_pause(1)
+        else:
+            self.set_pause(0)
+
+    def set_pause(self, do_pause):
+        with self._lock:
+            if do_pause and self._state == State.Playing:
+                self._base_ms = self.get_time()
+                self._invalidate()
+                self._state = State.Paused
+                paused = True
+            elif not do_pause and self._state == State.Paused:
+                paused = False
+            else:
+                return
+        if paused:
+            self._events.emit(EventType.MediaPlayerPaused)
+        else:
+            self.play()
+
+    def stop(self):
+        with self._lock:
+            if self._media is None:
+                return
+            self._invalidate()
+            self._state = State.Stopped
+            self._base_ms = 0
+            self._seekable = False
+            self._started = False
+        self._events.emit(EventType.MediaPlayerStopped)
+
+    def set_time(self, ms):
+        with self._lock:
+            if not self._seekable:
+                return -1
+            media = self._media
+        self._backend.scheduler.call_later(self._backend.seek_delay_ms, self._on_seek, media, int(ms))
+        return 0
+
+    def set_position(self, position):
+        length = self.get_length()
+        if length > 0:
+            self.set_time(int(position * length))
+
+    def release(self):
+        with self._lock:
+            self._invalidate()
+            self._media = None
+
+    # --- Implementación interna ---
+
+    def _invalidate(self):
+        self._generation += 1
+        return self._generation
+
+    def _on_started(self, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            first_start = not self._started
+            self._started = True
+            self._seekable = True
+            self._state = State.Playing
+            self._anchor_ms = self._backend.clock.now_ms()
+            media = self._media
+        if first_start:
+            self._events.emit(EventType.MediaPlayerLengthChanged, new_length=media.length_ms)
+            self._events.emit(EventType.MediaPlayerSeekableChanged, new_seekable=1)
+            if media.has_video:
+                self._events.emit(EventType.MediaPlayerVout, new_count=1)
+        self._events.emit(EventType.MediaPlayerPlaying)
+        self._schedule_playback(generation)
+
+    def _on_seek(self, media, ms):
+        with self._lock:
+            # Descartar saltos de un medio ya sustituido o detenido
+            if self._media is not media or self._state not in (State.Playing, State.Paused, State.Ended):
+                return
+            self._base_ms = max(0, min(ms, self._media.length_ms))
+            self._anchor_ms = self._backend.clock.now_ms()
+            generation = self._invalidate()
+            playing = self._state == State.Playing
+            if self._state == State.Ended:
+                self._state = State.Paused
+        self._events.emit(EventType.MediaPlayerTimeChanged, new_time=int(self._base_ms))
+        if playing:
+            self._schedule_playback(generation)
+
+    def _schedule_playback(self, generation):
+        """Próximo TimeChanged y, si llega antes, el final del archivo."""
+        remaining = self._media.length_ms - self.get_time()
+        tick = self._backend.time_tick_ms
+        if remaining <= tick:
+            self._backend.scheduler.call_later(remaining, self._on_end, generation)
+        else:
+            self._backend.scheduler.call_later(tick, self._on_tick, generation)
+
+    def _on_tick(self, generation):
+        with self._lock:
+            if generation != self._generation or self._state != State.Playing:
+                return
+            current = self.get_time()
+        self._events.emit(EventType.MediaPlayerTimeChanged, new_time=current)
+        self._schedule_playback(generation)
+
+    def _on_end(self, generation):
+        with self._lock:
+            if generation != self._generation or self._state != State.Playing:
+                return
+            self._base_ms = self._media.length_ms
+            self._invalidate()
+            self._state = State.Ended
+            self.ended_at = time.perf_counter()
+        self._events.emit(EventType.MediaPlayerTimeChanged, new_time=self._media.length_ms)
+        self._events.emit(EventType.MediaPlayerEndReached)
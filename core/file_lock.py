@@ -0,0 +1,84 @@
+# core/file_lock.py
+import os
+import threading
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Reintento mientras otro proceso tiene el lock
+RETRY_INTERVAL_S = 0.01
+
+
+class FileLock:
+    """
+    Lock consultivo entre procesos sobre un archivo auxiliar (msvcrt en
+    Windows, fcntl en el resto). Solo protege frente a otros procesos que
+    usen el mismo lock: la UI, una segunda instancia o hotkey_server.py.
+
+    También excluye a los hilos del propio proceso, así que se puede usar
+    igual que un threading.Lock (`with lock:`). No es reentrante.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        try:
+            if self._fd is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock_fd()
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        try:
+            self._unlock_fd()
+        finally:
+            self._thread_lock.release()
+
+    def close(self):
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    # ---------------------------------------------------------
+    # IMPLEMENTACIÓN INTERNA
+    # ---------------------------------------------------------
+
+    if os.name == "nt":
+        def _lock_fd(self):
+            # LK_NBLCK sobre el primer byte; LK_LOCK se rinde tras 10 s
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                    return
+                except OSError:
+                    time.sleep(RETRY_INTERVAL_S)
+
+        def _unlock_fd(self):
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+    else:
+        def _lock_fd(self):
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+        def _unlock_fd(self):
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
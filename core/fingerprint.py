@@ -0,0 +1,61 @@
+# core/fingerprint.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Bytes leídos de cada zona del archivo (inicio, mitad y final)
+CHUNK_SIZE = 64 * 1024
+# Huellas memorizadas (una por versión de archivo)
+MEMO_MAX_ENTRIES = 2048
+
+_memo: "OrderedDict[str, tuple[int, int, str]]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def fingerprint(media_path: str) -> Optional[str]:
+    """
+    Huella de contenido barata: tamaño + blake2b de los primeros, centrales
+    y últimos 64 KB. Identifica la misma grabación aunque se copie a otra
+    carpeta o unidad, leyendo como mucho 192 KB.
+
+    Se memoriza por (ruta, tamaño, mtime): solo se recalcula si el archivo
+    cambia. Devuelve None si el archivo no se puede leer.
+    """
+    try:
+        st = os.stat(media_path)
+    except OSError:
+        return None
+    path = os.path.normcase(os.path.abspath(media_path))
+
+    with _memo_lock:
+        cached = _memo.get(path)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            _memo.move_to_end(path)
+            return cached[2]
+
+    try:
+        digest = _compute(media_path, st.st_size)
+    except OSError:
+        return None
+
+    with _memo_lock:
+        _memo[path] = (st.st_size, st.st_mtime_ns, digest)
+        _memo.move_to_end(path)
+        while len(_memo) > MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+    return digest
+
+
+def _compute(media_path: str, size: int) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(size.to_bytes(8, "little"))
+    with open(media_path, "rb") as f:
+        if size <= 3 * CHUNK_SIZE:
+            h.update(f.read())
+        else:
+            for offset in (0, (size - CHUNK_SIZE) // 2, size - CHUNK_SIZE):
+                f.seek(offset)
+                h.update(f.read(CHUNK_SIZE))
+    return f"{size:x}-{h.hexdigest()}"
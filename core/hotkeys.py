@@ -1,4 +1,5 @@
 # core/hotkeys.py
+import queue
 import threading
 import logging
 from gui.i18n import tr # Add this import
@@ -6,13 +7,45 @@ from gui.i18n import tr # Add this import
 class HotkeyManager:
     """
     Gestiona hotkeys globales de forma más robusta usando `keyboard.add_hotkey`.
+
+    Los callbacks no se ejecutan en el hilo de `keyboard` (bloquearlo retrasa
+    todo el teclado) ni en un hilo nuevo por pulsación: se encolan y los
+    ejecuta, en orden, un único hilo despachador de larga vida. Así la
+    autorrepetición de F3/F4 no crea hilos y pulsación/liberación nunca se
+    adelantan entre sí.
     """
     def __init__(self):
         self._lock = threading.Lock()
         self.keyboard = None  # Se inicializará de forma perezosa
+        self._queue = queue.Queue()
+        self._dispatcher = None
+        self.dispatched = 0  # Callbacks ejecutados (métrica)
+
+    def _dispatch(self, callback):
+        """Encola el callback para el hilo despachador (se llama desde el hilo de `keyboard`)."""
+        self._queue.put(callback)
+
+    def _dispatcher_loop(self):
+        while True:
+            callback = self._queue.get()
+            if callback is None:  # Centinela de stop()
+                return
+            self._execute_callback(callback)
+            self.dispatched += 1
+
+    def _start_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatcher_loop, name="HotkeyDispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _stop_dispatcher(self):
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            self._queue.put(None)  # Tras los callbacks ya encolados
+            self._dispatcher.join(timeout=2.0)
+        self._dispatcher = None
 
     def _execute_callback(self, callback):
-        """Ejecuta un callback en un hilo separado y maneja excepciones."""
+        """Ejecuta un callback en el hilo despachador y maneja excepciones."""
         try:
             callback()
         except Exception as e:
@@ -37,6 +70,7 @@ class HotkeyManager:
             # Limpiar CUALQUIER estado anterior de la librería para un inicio limpio.
             # Esto es más robusto que clear_all_hotkeys().
             self.keyboard.unhook_all()
+            self._start_dispatcher()
 
             # Instalar un hook global base. Esto a veces ayuda a estabilizar la captura
             # de eventos antes de registrar hotkeys específicas que los suprimen.
@@ -50,11 +84,11 @@ class HotkeyManager:
                 # Registrar callbacks de pulsación
                 for key, callback in press_callbacks.items():
                     # Usamos una función anónima (lambda) para asegurar que el callback se capture
-                    # correctamente en el bucle y se ejecute en un hilo.
+                    # correctamente en el bucle y se encole para el hilo despachador.
                     # El argumento `suppress=True` es clave para que la hotkey sea exclusiva.
                     self.keyboard.add_hotkey(
                         key,
-                        lambda cb=callback: threading.Thread(target=self._execute_callback, args=(cb,)).start(),
+                        lambda cb=callback: self._dispatch(cb),
                         suppress=True
                     )
                     logging.info(tr("hotkeys_press_registered", key=key))
@@ -63,7 +97,7 @@ class HotkeyManager:
                 for key, callback in release_callbacks.items():
                     self.keyboard.add_hotkey(
                         key,
-                        lambda cb=callback: threading.Thread(target=self._execute_callback, args=(cb,)).start(),
+                        lambda cb=callback: self._dispatch(cb),
                         suppress=True,
                         trigger_on_release=True
                     )
@@ -81,4 +115,5 @@ class HotkeyManager:
                 self.keyboard.unhook_all()
                 logging.info(tr("hotkeys_all_stopped_released"))
             else:
-                logging.warning(tr("hotkeys_stop_failed_not_loaded"))
\ No newline at end of file
+                logging.warning(tr("hotkeys_stop_failed_not_loaded"))
+            self._stop_dispatcher()
\ No newline at end of file
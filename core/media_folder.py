@@ -0,0 +1,41 @@
+# core/media_folder.py
+import logging
+import os
+
+# Extensiones que se consideran parte de la cola "siguiente en la carpeta"
+MEDIA_EXTENSIONS = (
+    ".wav", ".mp3", ".m4a", ".aac", ".wma", ".ogg", ".opus", ".flac",
+    ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".webm",
+)
+
+
+def list_media(folder: str) -> list[str]:
+    """Archivos multimedia de la carpeta, en orden alfabético (sin distinguir mayúsculas)."""
+    try:
+        with os.scandir(folder) as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(MEDIA_EXTENSIONS)
+            ]
+    except OSError as e:
+        logging.warning(f"No se pudo listar '{folder}': {e}")
+        return []
+    names.sort(key=str.casefold)
+    return [os.path.join(folder, name) for name in names]
+
+
+def next_in_folder(path: str):
+    """
+    Siguiente archivo multimedia tras `path` en su carpeta, o None si es
+    el último. Las grabaciones de un caso (p. ej. el .mp4 y el .wav de una
+    misma hora) quedan así consecutivas.
+    """
+    if not path:
+        return None
+    folder = os.path.dirname(os.path.abspath(path))
+    current = os.path.normcase(os.path.basename(path))
+    files = list_media(folder)
+    for i, candidate in enumerate(files):
+        if os.path.normcase(os.path.basename(candidate)) == current:
+            return files[i + 1] if i + 1 < len(files) else None
+    return None
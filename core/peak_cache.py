@@ -0,0 +1,189 @@
+# core/peak_cache.py
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+
+from core.fingerprint import fingerprint
+from core.playback_state import STATE_FILE_PATH
+
+# Caché de picos junto a config/playback_state.json
+CACHE_DIR = os.path.join(os.path.dirname(STATE_FILE_PATH), "waveform_cache")
+CACHE_VERSION = 1
+# Límites de la caché: cada versión de un archivo deja una entrada nueva
+# (la clave es su huella), así que sin tope crecería para siempre
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_MAX_AGE_DAYS = 90
+
+
+def cache_key(media_path: str) -> Optional[str]:
+    """
+    Clave de caché: huella de contenido (core.fingerprint). Las copias del
+    mismo archivo en otras carpetas o unidades comparten picos, índice de
+    voz y espectrograma; un archivo modificado produce una clave nueva.
+    """
+    return fingerprint(media_path)
+
+
+def load_pyramid(key: str) -> Optional[list[np.ndarray]]:
+    """
+    Abre los picos cacheados con numpy.memmap (sin leerlos a memoria).
+    Devuelve la lista de niveles de la pirámide o None si no hay caché válida.
+    """
+    meta_path, data_path = _paths(key)
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            return None
+
+        data = np.load(data_path, mmap_mode="r")
+        levels = []
+        offset = 0
+        for length in meta["lengths"]:
+            levels.append(data[offset:offset + length])
+            offset += length
+        if offset != len(data):
+            return None
+        _touch(meta_path)
+        return levels
+    except Exception as e:
+        # Caché corrupta → se recalcula
+        logging.warning(f"Caché de picos inválida ({key}): {e}")
+        return None
+
+
+def store_pyramid(key: str, media_path: str, levels: list[np.ndarray]):
+    """
+    Escribe los niveles concatenados en un .npy y sus metadatos en un .json.
+    Ambos se escriben a un temporal y se renombran: el .json (que se escribe
+    al final) marca la entrada como completa.
+    """
+    meta_path, data_path = _paths(key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        tmp_data = data_path + ".tmp"
+        with open(tmp_data, "wb") as f:
+            np.save(f, np.concatenate(levels).astype(np.float32, copy=False))
+        os.replace(tmp_data, data_path)
+
+        meta = {
+            "version": CACHE_VERSION,
+            "media_path": media_path,
+            "lengths": [len(level) for level in levels],
+        }
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+    except Exception as e:
+        # Fallo silencioso: la caché es solo una optimización
+        logging.warning(f"No se pudo guardar la caché de picos: {e}")
+
+
+def load_speech(key: str) -> Optional[np.ndarray]:
+    """Índice de voz (n, 2) int32 en buckets, o None si no está cacheado."""
+    path = os.path.join(CACHE_DIR, key + ".speech.npy")
+    try:
+        return np.load(path) if os.path.exists(path) else None
+    except Exception:
+        return None
+
+
+def store_speech(key: str, intervals: np.ndarray):
+    """Guarda el índice de voz junto a los picos (tmp + rename)."""
+    path = os.path.join(CACHE_DIR, key + ".speech.npy")
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, intervals.astype(np.int32, copy=False))
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        logging.warning(f"No se pudo guardar el índice de voz: {e}")
+
+
+def spectrogram_dir(key: str) -> str:
+    """Directorio de los tiles de espectrograma (PNG) de un archivo."""
+    return os.path.join(CACHE_DIR, key + ".spec")
+
+
+def prune(max_bytes: Optional[int] = DEFAULT_MAX_BYTES, max_age_days: Optional[int] = DEFAULT_MAX_AGE_DAYS) -> int:
+    """
+    Borra las entradas no usadas en `max_age_days` días y, si aún se pasa de
+    `max_bytes`, las menos recientes (LRU por mtime: abrir los picos lo
+    actualiza). Una entrada son todos los archivos de una clave: picos,
+    índice de voz y tiles de espectrograma. Devuelve cuántas se borraron.
+    """
+    entries = {}    # clave -> [último uso, bytes, rutas]
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            used, size = _usage(path)
+        except OSError:
+            continue
+        entry = entries.setdefault(name.split(".", 1)[0], [0.0, 0, []])
+        entry[0] = max(entry[0], used)
+        entry[1] += size
+        entry[2].append(path)
+
+    evict = []
+    if max_age_days is not None:
+        cutoff = time.time() - max_age_days * 86400
+        evict = [key for key, (used, _, _) in entries.items() if used < cutoff]
+    if max_bytes is not None:
+        remaining = sorted((key for key in entries if key not in evict), key=lambda key: entries[key][0])
+        total = sum(entries[key][1] for key in remaining)
+        while remaining and total > max_bytes:
+            key = remaining.pop(0)
+            total -= entries[key][1]
+            evict.append(key)
+
+    for key in evict:
+        for path in entries[key][2]:
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError as e:
+                logging.debug(f"No se pudo borrar de la caché de picos '{path}': {e}")
+    if evict:
+        logging.info(f"Caché de picos podada: {len(evict)} de {len(entries)} entradas")
+    return len(evict)
+
+
+def _usage(path: str):
+    """(último uso, bytes) de un archivo o del directorio de tiles."""
+    st = os.stat(path)
+    if not os.path.isdir(path):
+        return st.st_mtime, st.st_size
+    used, size = st.st_mtime, 0
+    for entry in os.scandir(path):
+        est = entry.stat()
+        used = max(used, est.st_mtime)
+        size += est.st_size
+    return used, size
+
+
+def _touch(path: str):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _paths(key: str):
+    base = os.path.join(CACHE_DIR, key)
+    return base + ".json", base + ".npy"
@@ -0,0 +1,97 @@
+# core/playback_clock.py
+import time
+
+# Error (ms) entre predicción y muestra a partir del cual se considera un
+# salto y se re-ancla en seco; por debajo se corrige de forma gradual.
+RESYNC_THRESHOLD_MS = 400
+# Fracción del error corregida con cada muestra (suaviza el jitter de VLC)
+CORRECTION_GAIN = 0.35
+
+
+class PlaybackClock:
+    """
+    Reloj de reproducción del lado de la UI.
+
+    Se ancla en cada muestra (instante monotónico, tiempo del medio) que
+    envía el Player y extrapola la posición entre muestras, de modo que la
+    UI puede dibujar a la cadencia de pantalla sin preguntar a libVLC.
+    """
+
+    def __init__(self):
+        self._anchor_ms = 0.0       # Tiempo del medio en el ancla
+        self._anchor_at = 0.0       # time.monotonic() del ancla
+        self._rate = 1.0
+        self._running = False
+        self.total_ms = 0
+
+    # ---------------------------------------------------------
+    # MUESTRAS Y CONTROL
+    # ---------------------------------------------------------
+
+    def sample(self, media_ms: int, total_ms: int, sampled_at: float = None):
+        """Nueva muestra del Player: corrige la extrapolación o re-ancla si hubo salto."""
+        sampled_at = time.monotonic() if sampled_at is None else sampled_at
+        self.total_ms = total_ms
+
+        if not self._running:
+            self._anchor(media_ms, sampled_at)
+            return
+
+        predicted = self._extrapolate(sampled_at)
+        error = media_ms - predicted
+        if abs(error) >= RESYNC_THRESHOLD_MS:
+            self._anchor(media_ms, sampled_at)
+        else:
+            self._anchor(predicted + error * CORRECTION_GAIN, sampled_at)
+
+    def seek(self, media_ms: int):
+        """Salto pedido por la UI: re-anclar en el destino sin esperar al Player."""
+        self._anchor(media_ms, time.monotonic())
+
+    def start(self):
+        if not self._running:
+            self._anchor_at = time.monotonic()
+            self._running = True
+
+    def stop(self):
+        """Congela el reloj en la posición actual (pausa, fin, stop)."""
+        if self._running:
+            self._anchor(self._extrapolate(time.monotonic()), time.monotonic())
+            self._running = False
+
+    def set_rate(self, rate: float):
+        now = time.monotonic()
+        self._anchor(self._extrapolate(now), now)
+        self._rate = rate
+
+    def reset(self):
+        self._running = False
+        self._anchor(0, time.monotonic())
+        self.total_ms = 0
+
+    # ---------------------------------------------------------
+    # CONSULTA
+    # ---------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def now_ms(self) -> int:
+        return int(self._extrapolate(time.monotonic()))
+
+    # ---------------------------------------------------------
+    # IMPLEMENTACIÓN INTERNA
+    # ---------------------------------------------------------
+
+    def _anchor(self, media_ms, at):
+        self._anchor_ms = media_ms
+        self._anchor_at = at
+
+    def _extrapolate(self, at):
+        position = self._anchor_ms
+        if self._running:
+            position += (at - self._anchor_at) * 1000.0 * self._rate
+        if self.total_ms > 0:
+            position = min(position, self.total_ms)
+        return max(0.0, position)
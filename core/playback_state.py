@@ -1,12 +1,51 @@
-import json
+import atexit
+import logging
 import os
 import threading
-from datetime import datetime
+import time
+from collections import OrderedDict, deque
 from typing import Optional
 
+from core.fingerprint import fingerprint
+from core.playback_store import PlaybackEntry, open_store
+
 # Ruta del archivo de estado (dentro de /config)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 STATE_FILE_PATH = os.path.join(BASE_DIR, "config", "playback_state.json")
+STATE_DB_PATH = os.path.join(BASE_DIR, "config", "playback_state.sqlite3")
+
+# Write-behind: los cambios se acumulan en memoria y se vuelcan como mucho
+# una vez por intervalo (y siempre al cerrar)
+FLUSH_INTERVAL_S = 5.0
+# Operaciones encoladas para el hilo escritor; si se llena se descarta el
+# guardado más antiguo (el siguiente guardado de ese archivo lo repone)
+WRITE_QUEUE_MAX = 256
+# Espera máxima de flush() (al cerrar la aplicación)
+FLUSH_TIMEOUT_S = 10.0
+# Reintento tras un fallo de escritura (antivirus, archivo bloqueado...):
+# empieza en FLUSH_INTERVAL_S y se dobla hasta este máximo
+RETRY_MAX_INTERVAL_S = 60.0
+# Posiciones recordadas por ruta para responder sin tocar disco (LRU)
+INDEX_MAX_ENTRIES = 1024
+
+# Poda del historial al arrancar (None = sin límite)
+DEFAULT_MAX_AGE_DAYS = 365
+DEFAULT_MAX_ENTRIES = 5000
+
+_NOT_QUEUED = object()
+
+
+class _Op:
+    """Operación para el hilo escritor."""
+
+    __slots__ = ("kind", "path", "payload", "done", "result")
+
+    def __init__(self, kind, path=None, payload=None, wait=False):
+        self.kind = kind            # save, clear, clear_all, lookup, prune, flush
+        self.path = path            # Ruta normalizada (save/clear)
+        self.payload = payload
+        self.done = threading.Event() if wait else None
+        self.result = None
 
 
 class PlaybackState:
@@ -14,41 +53,86 @@ class PlaybackState:
     Gestiona el guardado y restauración automática de la posición de reproducción
     por archivo, de forma similar a SMPlayer.
 
-    - Persistencia por ruta absoluta
+    - Persistencia por huella de contenido (core.fingerprint): la posición
+      sigue al archivo aunque se copie a otra carpeta o unidad. Las entradas
+      antiguas, guardadas por ruta absoluta, se migran al leerlas
     - Posición en milisegundos
-    - Escrituras event-driven (no por tick)
+    - Todo el trabajo de disco (huellas, lecturas, escrituras, poda) en un
+      hilo escritor propio: save_position/clear solo encolan y
+      get_position responde desde memoria, así que vuelven en
+      microsegundos aunque el disco sea lento o de red
+    - Escrituras diferidas (write-behind): como mucho una cada FLUSH_INTERVAL_S
+    - Almacén intercambiable: "journal" (JSON + diario) o "sqlite"; ambos
+      admiten varios procesos a la vez (gana el last_seen más reciente)
+    - Poda en segundo plano al arrancar: archivos borrados, entradas
+      antiguas y exceso de entradas (se conservan las usadas más recientemente)
     - Totalmente desacoplado de UI y Player
     """
 
     _lock = threading.Lock()
 
-    def __init__(self):
-        self._state: dict[str, dict] = {}
-        self._load_state_from_disk()
+    def __init__(
+        self,
+        backend: str = "journal",
+        max_age_days: Optional[int] = DEFAULT_MAX_AGE_DAYS,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        prune_on_start: bool = True,
+    ):
+        # Cambios aplicados por el escritor y aún no volcados (None = borrado);
+        # tienen prioridad sobre el almacén. Solo el hilo escritor los modifica.
+        self._pending: dict[str, Optional[PlaybackEntry]] = {}
+        # Índice ruta → entrada (None = sin posición) que mantiene el
+        # escritor; get_position responde desde aquí sin tocar disco
+        self._index: "OrderedDict[str, Optional[PlaybackEntry]]" = OrderedDict()
+        # Operaciones aún no procesadas por el escritor, y el lote que está
+        # aplicando: siguen visibles para los lectores hasta terminar
+        self._ops: deque = deque()
+        self._in_flight: list = []
+        self._cond = threading.Condition()
+        self.disk_writes = 0                # Contador de escrituras reales a disco
+        self.dropped_writes = 0             # Guardados descartados por cola llena
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.last_prune_count = 0           # Entradas eliminadas en la última poda
+        self._store = None
+        self._open_store(backend)
+
+        self._writer = threading.Thread(target=self._writer_loop, name="PlaybackStateWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+        if prune_on_start:
+            threading.Thread(target=self.prune, name="PlaybackStatePrune", daemon=True).start()
 
     # -------------------------
     # API PÚBLICA
     # -------------------------
 
-    def get_position(self, media_path: str) -> Optional[int]:
+    def get_position(self, media_path: str, timeout: Optional[float] = None) -> Optional[int]:
         """
         Devuelve la última posición guardada (ms) para el archivo,
         o None si no existe o no es válida.
+
+        Sin `timeout` no toca disco (apta para el hilo de Tk): responde con
+        lo encolado o con el índice en memoria; si el archivo aún no está en
+        él, pide al escritor que lo lea y devuelve None. Con `timeout` espera
+        hasta ese tiempo una lectura fresca del almacén (hilos que pueden
+        bloquearse, como el del Player al terminar una carga).
         """
         path = self._normalize_path(media_path)
-        entry = self._state.get(path)
+        entry = self._queued_entry(path)
+        if entry is _NOT_QUEUED:
+            entry = self._lookup(path, timeout)
 
         if not entry:
             return None
 
-        position = entry.get("position_ms")
-        duration = entry.get("duration_ms")
+        position = entry.position_ms
+        duration = entry.duration_ms
 
         # Validaciones defensivas
         if (
-            position is None
-            or duration is None
-            or duration <= 0
+            duration <= 0
             or position < 0
             or position > duration
         ):
@@ -62,7 +146,7 @@ class PlaybackState:
 
     def save_position(self, media_path: str, position_ms: int, duration_ms: int):
         """
-        Guarda la posición actual del archivo.
+        Guarda la posición actual del archivo (solo encola: no toca disco).
         """
         if (
             not media_path
@@ -73,60 +157,315 @@ class PlaybackState:
             return
 
         path = self._normalize_path(media_path)
-
-        with self._lock:
-            self._state[path] = {
-                "position_ms": int(position_ms),
-                "duration_ms": int(duration_ms),
-                "last_seen": datetime.now().isoformat(timespec="seconds")
-            }
-            self._save_state_to_disk()
+        self._enqueue(_Op("save", path, PlaybackEntry(int(position_ms), int(duration_ms), int(time.time()), path)))
 
     def clear(self, media_path: str):
         """
         Elimina el estado guardado de un archivo específico.
         """
-        path = self._normalize_path(media_path)
-
-        with self._lock:
-            if path in self._state:
-                del self._state[path]
-                self._save_state_to_disk()
+        self._enqueue(_Op("clear", self._normalize_path(media_path)))
 
     def clear_all(self):
         """
         Borra completamente el estado de reproducción.
         """
-        with self._lock:
-            self._state.clear()
-            self._save_state_to_disk()
+        self._enqueue(_Op("clear_all"))
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT_S) -> bool:
+        """
+        Vuelca a disco todo lo encolado y pendiente, y espera a que termine.
+        El escritor lo hace solo cada FLUSH_INTERVAL_S; llamarla al cerrar la
+        aplicación. Devuelve False si no terminó dentro de `timeout` o si la
+        escritura falló (los cambios siguen pendientes y se reintentan).
+        """
+        if threading.current_thread() is self._writer:
+            return False
+        op = _Op("flush", wait=True)
+        self._enqueue(op)
+        return op.done.wait(timeout) and op.result is not False
+
+    def prune(self) -> int:
+        """
+        Elimina del historial las entradas de archivos que ya no existen, las
+        no usadas en `max_age_days` días y, si aún sobran, las menos recientes
+        por encima de `max_entries`. Devuelve cuántas se eliminaron.
+
+        Lenta (recorre disco): al arrancar se lanza en un hilo aparte.
+        """
+        try:
+            state = self._store.load()
+        except Exception as e:
+            logging.warning(f"No se pudo leer el historial para podarlo: {e}")
+            return 0
+
+        evict = self._missing_paths(state)
+
+        if self.max_age_days is not None:
+            cutoff = int(time.time()) - self.max_age_days * 86400
+            evict.update(path for path, entry in state.items() if entry.last_seen < cutoff)
+
+        if self.max_entries is not None:
+            remaining = [path for path in state if path not in evict]
+            if len(remaining) > self.max_entries:
+                remaining.sort(key=lambda path: state[path].last_seen, reverse=True)
+                evict.update(remaining[self.max_entries:])
+
+        if not evict:
+            self.last_prune_count = 0
+            return 0
+
+        # Las bajas las aplica el escritor, que es el único que escribe
+        op = _Op("prune", payload={path: state[path].last_seen for path in evict}, wait=True)
+        self._enqueue(op)
+        op.done.wait()
+        removed = op.result or 0
+
+        self.last_prune_count = removed
+        logging.info(f"Historial de reproducción podado: {removed} de {len(state)} entradas")
+        return removed
 
     # -------------------------
     # IMPLEMENTACIÓN INTERNA
     # -------------------------
 
-    def _normalize_path(self, path: str) -> str:
-        return os.path.normcase(os.path.abspath(path))
+    def _lookup(self, path: str, timeout: Optional[float]) -> Optional[PlaybackEntry]:
+        if timeout is not None and threading.current_thread() is not self._writer:
+            op = _Op("lookup", path, wait=True)
+            self._enqueue(op)
+            if op.done.wait(timeout):
+                return op.result
+        with self._lock:
+            if path in self._index:
+                self._index.move_to_end(path)
+                return self._index[path]
+        if timeout is None:
+            self._enqueue(_Op("lookup", path))
+        return None
 
-    def _load_state_from_disk(self):
-        if not os.path.exists(STATE_FILE_PATH):
-            return
+    def _remember(self, path: str, entry: Optional[PlaybackEntry]):
+        """Actualiza el índice en memoria (con _lock tomado)."""
+        self._index[path] = entry
+        self._index.move_to_end(path)
+        while len(self._index) > INDEX_MAX_ENTRIES:
+            self._index.popitem(last=False)
 
+    def _get_entry(self, path: str) -> Optional[PlaybackEntry]:
+        with self._lock:
+            if path in self._pending:
+                return self._pending[path]
         try:
-            with open(STATE_FILE_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    self._state = data
+            return self._store.get(path)
         except Exception:
-            # Archivo corrupto → no romper la app
-            self._state = {}
+            return None
+
+    def _queued_entry(self, path: str):
+        """Último guardado/borrado de `path` aún sin aplicar, o _NOT_QUEUED."""
+        with self._cond:
+            for op in (*reversed(self._ops), *reversed(self._in_flight)):
+                if op.kind == "clear_all" or (op.kind == "clear" and op.path == path):
+                    return None
+                if op.kind == "save" and op.path == path:
+                    return op.payload
+        return _NOT_QUEUED
+
+    def _enqueue(self, op: _Op):
+        with self._cond:
+            if op.kind == "lookup" and op.done is None and any(
+                queued.kind == "lookup" and queued.path == op.path for queued in self._ops
+            ):
+                return  # Ya pedida
+            if op.kind == "save":
+                self._drop_queued_save(op.path)
+                if len(self._ops) >= WRITE_QUEUE_MAX:
+                    self._drop_oldest_save()
+            self._ops.append(op)
+            self._cond.notify()
+
+    def _drop_queued_save(self, path: str):
+        """Último gana: quita el guardado en cola del mismo archivo (con _cond tomado)."""
+        for i in range(len(self._ops) - 1, -1, -1):
+            op = self._ops[i]
+            if op.path == path or op.kind == "clear_all":
+                if op.kind == "save":
+                    del self._ops[i]
+                return  # Otra operación sobre la ruta: no colapsar a través de ella
+
+    def _drop_oldest_save(self):
+        for i, op in enumerate(self._ops):
+            if op.kind == "save":
+                del self._ops[i]
+                self.dropped_writes += 1
+                return
+
+    def _normalize_path(self, path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _key_for(self, media_path: str, path: str) -> str:
+        """Clave de la entrada. Sin huella (archivo ilegible) la clave es la ruta."""
+        digest = fingerprint(media_path)
+        return f"fp:{digest}" if digest else path
+
+    # -------------------------
+    # HILO ESCRITOR
+    # -------------------------
+
+    def _writer_loop(self):
+        deadline = None     # Cuándo volcar lo pendiente (write-behind)
+        retry_s = FLUSH_INTERVAL_S
+        while True:
+            with self._cond:
+                while not self._ops:
+                    timeout = None if deadline is None else deadline - time.monotonic()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                batch = list(self._ops)
+                self._ops.clear()
+                self._in_flight = batch
+
+            waiting = []
+            for op in batch:
+                try:
+                    self._apply(op)
+                except Exception as e:
+                    logging.warning(f"Estado de reproducción: fallo al aplicar '{op.kind}': {e}")
+                if op.done is not None:
+                    waiting.append(op)
+            with self._cond:
+                self._in_flight = []
+
+            if self._pending and deadline is None:
+                deadline = time.monotonic() + FLUSH_INTERVAL_S
+            saved = True
+            if self._pending and (any(op.kind == "flush" for op in waiting) or time.monotonic() >= deadline):
+                saved = self._save_state_to_disk()
+                if saved:
+                    retry_s = FLUSH_INTERVAL_S
+                else:
+                    # Lo pendiente se conserva: reintentar con espera creciente
+                    deadline = time.monotonic() + retry_s
+                    retry_s = min(retry_s * 2, RETRY_MAX_INTERVAL_S)
+            if not self._pending:
+                deadline = None
+
+            for op in waiting:
+                if op.kind == "flush":
+                    op.result = saved
+                op.done.set()
 
-    def _save_state_to_disk(self):
-        os.makedirs(os.path.dirname(STATE_FILE_PATH), exist_ok=True)
+    def _apply(self, op: _Op):
+        if op.kind == "save":
+            key = self._key_for(op.path, op.path)
+            with self._lock:
+                self._pending[key] = op.payload
+                self._remember(op.path, op.payload)
+        elif op.kind == "clear":
+            key = self._key_for(op.path, op.path)
+            with self._lock:
+                self._pending[key] = None
+                self._pending[op.path] = None
+                self._remember(op.path, None)
+        elif op.kind == "lookup":
+            op.result = self._resolve(op.path)
+        elif op.kind == "clear_all":
+            with self._lock:
+                self._pending.clear()
+                self._index.clear()
+            self._store.replace_all({})
+            self.disk_writes += 1
+        elif op.kind == "prune":
+            op.result = self._apply_prune(op.payload)
+            if op.result:
+                with self._lock:
+                    self._index.clear()   # Claves por huella: no se sabe qué rutas caen
 
+    def _resolve(self, path: str) -> Optional[PlaybackEntry]:
+        """Lee la entrada de `path` del almacén y la deja en el índice (hilo escritor)."""
+        key = self._key_for(path, path)
+        entry = self._get_entry(key)
+        if entry is None and key != path:
+            entry = self._get_entry(path)
+            if entry:
+                # Entrada antigua por ruta → pasarla a la huella
+                entry = entry.with_path(path)
+                with self._lock:
+                    self._pending[key] = entry
+                    self._pending[path] = None
+        with self._lock:
+            self._remember(path, entry)
+        return entry
+
+    def _apply_prune(self, candidates: dict) -> int:
+        """
+        Borra las candidatas que no se hayan vuelto a usar desde la lectura.
+        El almacén compara last_seen y borra en la misma operación atómica,
+        así que un guardado de otro proceso entretanto no se pierde.
+        """
+        expected = {key: last_seen for key, last_seen in candidates.items() if key not in self._pending}
+        if not expected:
+            return 0
+        removed = self._store.delete_unchanged(expected)
+        self.disk_writes += 1
+        return removed
+
+    def _missing_paths(self, state: dict) -> set:
+        """
+        Claves del historial cuyo archivo (última ruta conocida) ya no
+        existe. Un os.scandir por carpeta en lugar de un stat por archivo.
+        Las unidades no conectadas (USB, red) se saltan: sus entradas no se
+        dan por perdidas.
+        """
+        by_folder: dict[str, list[tuple[str, str]]] = {}
+        for key, entry in state.items():
+            path = entry.path or key
+            by_folder.setdefault(os.path.dirname(path), []).append((key, path))
+
+        missing = set()
+        for folder, items in by_folder.items():
+            try:
+                with os.scandir(folder) as entries:
+                    names = {os.path.normcase(entry.name) for entry in entries}
+            except FileNotFoundError:
+                if self._volume_online(folder):
+                    missing.update(key for key, _ in items)   # Carpeta borrada
+                continue
+            except OSError:
+                continue                    # Sin permiso, red caída...: no decidir
+            missing.update(key for key, path in items if os.path.normcase(os.path.basename(path)) not in names)
+        return missing
+
+    @staticmethod
+    def _volume_online(folder: str) -> bool:
+        drive = os.path.splitdrive(folder)[0]
+        return os.path.isdir(drive + os.sep) if drive else True
+
+    def _open_store(self, backend: str):
         try:
-            with open(STATE_FILE_PATH, "w", encoding="utf-8") as f:
-                json.dump(self._state, f, indent=2, ensure_ascii=False)
-        except Exception:
-            # Fallo silencioso: nunca bloquear la UI
-            pass
\ No newline at end of file
+            self._store = open_store(backend, STATE_FILE_PATH, STATE_DB_PATH)
+        except Exception as e:
+            # Almacén ilegible → no romper la app (se sigue solo en memoria)
+            logging.warning(f"No se pudo abrir el estado de reproducción ({backend}): {e}")
+            self._store = open_store("memory", STATE_FILE_PATH, STATE_DB_PATH)
+
+    def _save_state_to_disk(self) -> bool:
+        """
+        Vuelca al almacén solo las claves con cambios (hilo escritor). La
+        escritura va sin el lock: los lectores siguen viendo `_pending`
+        hasta que el almacén ya tiene los datos. Si falla, lo pendiente se
+        conserva para el reintento y devuelve False.
+        """
+        with self._lock:
+            changes = dict(self._pending)
+        try:
+            self._store.write(changes)
+        except Exception as e:
+            # Sin propagar: nunca bloquear la UI; el escritor reintenta
+            logging.warning(f"No se pudo guardar el estado de reproducción (se reintentará): {e}")
+            return False
+        self.disk_writes += 1
+        logging.debug(f"Estado de reproducción guardado ({len(changes)} cambios, {self.disk_writes} escrituras)")
+        with self._lock:
+            for key, entry in changes.items():
+                if self._pending.get(key, _NOT_QUEUED) is entry:
+                    del self._pending[key]
+        return True
\ No newline at end of file
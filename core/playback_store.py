@@ -0,0 +1,709 @@
+# core/playback_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from core.file_lock import FileLock
+
+# Registros de diario a partir de los cuales se compacta en segundo plano
+COMPACT_AFTER_RECORDS = 500
+# Espera de SQLite cuando otro proceso tiene la base bloqueada
+SQLITE_BUSY_TIMEOUT_S = 10.0
+# PRAGMA user_version a partir de la cual el JSON antiguo ya está migrado
+LEGACY_MIGRATED_VERSION = 1
+
+
+class PlaybackEntry:
+    """
+    Entrada del historial. Registro con __slots__ (sin dict por instancia):
+    con miles de entradas en memoria ocupa una fracción de un dict, y
+    last_seen es un entero (segundos epoch) que solo se formatea como
+    fecha ISO al serializar a JSON.
+    """
+
+    __slots__ = ("position_ms", "duration_ms", "last_seen", "path")
+
+    def __init__(self, position_ms: int, duration_ms: int, last_seen: int, path: Optional[str] = None):
+        self.position_ms = position_ms
+        self.duration_ms = duration_ms
+        self.last_seen = last_seen      # Segundos epoch
+        self.path = path                # Última ruta normalizada del archivo
+
+    def with_path(self, path: str) -> "PlaybackEntry":
+        return PlaybackEntry(self.position_ms, self.duration_ms, self.last_seen, path)
+
+    def to_dict(self) -> dict:
+        """Formato JSON de siempre (last_seen como fecha ISO local con su desfase UTC)."""
+        data = {
+            "position_ms": self.position_ms,
+            "duration_ms": self.duration_ms,
+            "last_seen": format_last_seen(self.last_seen),
+        }
+        if self.path:
+            data["path"] = self.path
+        return data
+
+    @classmethod
+    def from_dict(cls, data) -> Optional["PlaybackEntry"]:
+        """Entrada desde JSON; None si no es válida."""
+        if not isinstance(data, dict):
+            return None
+        try:
+            return cls(
+                int(data["position_ms"]),
+                int(data["duration_ms"]),
+                parse_last_seen(data.get("last_seen")),
+                data.get("path"),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def format_last_seen(epoch_s: int) -> str:
+    """
+    Hora local con desfase explícito ("...T02:30:00+01:00"): legible y sin
+    ambigüedad en la hora que se repite al atrasar el reloj (cambio de hora).
+    """
+    return datetime.fromtimestamp(epoch_s).astimezone().isoformat(timespec="seconds")
+
+
+def parse_last_seen(value) -> int:
+    """
+    Fecha ISO (o entero) → segundos epoch; 0 si falta o no se entiende.
+    Las fechas antiguas sin desfase se leen como hora local.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError, OverflowError, OSError):
+        return 0
+
+
+class PlaybackStore:
+    """
+    Almacenamiento persistente de PlaybackState: clave → PlaybackEntry. La
+    clave es la huella de contenido ("fp:...") o, en entradas antiguas, la
+    ruta normalizada. PlaybackState solo guarda en memoria los cambios
+    pendientes de volcar; las lecturas van al almacén.
+    """
+
+    def open(self):
+        """Prepara el almacén (cargar, crear tablas...)."""
+        pass
+
+    def get(self, path: str) -> Optional[PlaybackEntry]:
+        """Entrada de una clave, o None."""
+        raise NotImplementedError
+
+    def load(self) -> dict:
+        """Estado completo guardado."""
+        raise NotImplementedError
+
+    def write(self, changes: dict[str, Optional[PlaybackEntry]]):
+        """Aplica cambios; una entrada None borra la clave."""
+        raise NotImplementedError
+
+    def delete_unchanged(self, expected: dict[str, int]) -> int:
+        """
+        Borra las claves cuyo last_seen sigue siendo el esperado, comprobado
+        de forma atómica frente a otros procesos (la poda no debe llevarse
+        un guardado hecho entre su lectura y su borrado). Devuelve cuántas.
+        """
+        raise NotImplementedError
+
+    def replace_all(self, state: dict):
+        """Sustituye todo el contenido (p. ej. clear_all)."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryStore(PlaybackStore):
+    """Solo en memoria: respaldo cuando el almacén real no se puede abrir."""
+
+    def __init__(self):
+        self._state: dict[str, PlaybackEntry] = {}
+
+    def get(self, path: str) -> Optional[PlaybackEntry]:
+        return self._state.get(path)
+
+    def load(self) -> dict:
+        return dict(self._state)
+
+    def write(self, changes: dict[str, Optional[PlaybackEntry]]):
+        for path, entry in changes.items():
+            if entry is None:
+                self._state.pop(path, None)
+            else:
+                self._state[path] = entry
+
+    def delete_unchanged(self, expected: dict[str, int]) -> int:
+        removed = 0
+        for path, last_seen in expected.items():
+            current = self._state.get(path)
+            if current is not None and current.last_seen == last_seen:
+                del self._state[path]
+                removed += 1
+        return removed
+
+    def replace_all(self, state: dict):
+        self._state = dict(state)
+
+
+class JournalStore(PlaybackStore):
+    """
+    Snapshot JSON + diario JSONL de solo añadido.
+
+    - Cada escritura añade una línea por ruta cambiada al diario (O(cambios),
+      sin reescribir el archivo). Una línea a medias tras un corte se ignora.
+    - Al cargar: snapshot y, encima, el diario en orden.
+    - Cuando el diario crece, se compacta en segundo plano: se rota el diario,
+      se escribe un snapshot nuevo (temporal + rename) y se borra el rotado.
+      Reaplicar un diario rotado sobre el snapshot es idempotente, así que un
+      corte en cualquier punto de la compactación no pierde datos.
+
+    Varios procesos (p. ej. dos instancias de la UI) pueden compartir los
+    archivos: toda modificación va bajo un lock consultivo (`.lock`), y antes
+    de escribir se incorporan las líneas que hayan añadido los demás. Al
+    fusionar gana la entrada con el last_seen más reciente, así que un
+    proceso con datos atrasados no pisa a otro.
+
+    El snapshot mantiene el formato de siempre de playback_state.json. El
+    estado completo vive en memoria (se lee entero al abrir); para historiales
+    grandes conviene SqliteStore.
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".journal"
+        self.rotated_path = self.journal_path + ".old"
+
+        self._state: dict[str, PlaybackEntry] = {}
+        self._io_lock = threading.Lock()         # Estado y posición de lectura (hilos)
+        self._file_lock = FileLock(os.path.splitext(snapshot_path)[0] + ".lock")  # Entre procesos
+        self._compact_lock = threading.Lock()    # Una compactación a la vez
+        self.records = 0                         # Registros en el diario actual
+        self.appends = 0                         # Escrituras a disco (métrica)
+
+        # Hasta dónde se ha leído: cualquier cambio de estas firmas (otro
+        # proceso compactó, rotó o vació) obliga a releer todo
+        self._loaded = False
+        self._snapshot_sig = None
+        self._rotated_sig = None
+        self._journal_id = None
+        self._offset = 0
+
+    # ---------------------------------------------------------
+    # API
+    # ---------------------------------------------------------
+
+    def open(self):
+        with self._io_lock, self._file_lock:
+            self._catch_up(repair=True)
+        if self.needs_compaction():
+            self.compact_async()
+
+    def get(self, path: str) -> Optional[PlaybackEntry]:
+        # Sin esperar: si el propio proceso está escribiendo, se responde con
+        # lo ya leído (consultar el dict es atómico y las entradas no se mutan)
+        if self._io_lock.acquire(blocking=False):
+            try:
+                self._catch_up(repair=False)
+            except OSError as e:
+                logging.debug(f"No se pudo releer el diario de reproducción: {e}")
+            finally:
+                self._io_lock.release()
+        return self._state.get(path)
+
+    def load(self) -> dict:
+        with self._io_lock:
+            self._catch_up(repair=False)
+            return dict(self._state)
+
+    def write(self, changes: dict[str, Optional[PlaybackEntry]]):
+        if not changes:
+            return
+        with self._io_lock, self._file_lock:
+            self._catch_up(repair=True)
+            accepted = {}
+            for path, entry in changes.items():
+                current = self._state.get(path)
+                if entry is not None and current is not None and current.last_seen > entry.last_seen:
+                    continue  # Otro proceso ya guardó algo más reciente
+                accepted[path] = entry
+            self._append(accepted)
+
+        if self.needs_compaction():
+            self.compact_async()
+
+    def delete_unchanged(self, expected: dict[str, int]) -> int:
+        with self._io_lock, self._file_lock:
+            # Comprobación y borrado bajo el mismo lock entre procesos
+            self._catch_up(repair=True)
+            deletes = {}
+            for path, last_seen in expected.items():
+                current = self._state.get(path)
+                if current is not None and current.last_seen == last_seen:
+                    deletes[path] = None
+            self._append(deletes)
+
+        if self.needs_compaction():
+            self.compact_async()
+        return len(deletes)
+
+    def needs_compaction(self) -> bool:
+        return self.records >= COMPACT_AFTER_RECORDS or os.path.exists(self.rotated_path)
+
+    def compact_async(self):
+        """Rota el diario ya y escribe el snapshot en un hilo aparte."""
+        if not self._compact_lock.acquire(blocking=False):
+            return  # Ya hay una en curso
+        try:
+            # Rotación y copia bajo el mismo lock: la copia es exactamente
+            # snapshot + diario rotado, sin escrituras de por medio. Las
+            # entradas se sustituyen (no se mutan): basta copia superficial.
+            with self._io_lock, self._file_lock:
+                self._catch_up(repair=True)
+                self._rotate()
+                state = dict(self._state)
+                rotated_sig = self._rotated_sig
+        except Exception as e:
+            self._compact_lock.release()
+            logging.warning(f"No se pudo rotar el diario de reproducción: {e}")
+            return
+        threading.Thread(target=self._finish_compaction, args=(state, rotated_sig), daemon=True).start()
+
+    def replace_all(self, state: dict):
+        with self._compact_lock:
+            with self._io_lock, self._file_lock:
+                self._write_snapshot(state)
+                for path in (self.journal_path, self.rotated_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._state = dict(state)
+                self.records = 0
+                self._snapshot_sig = _file_sig(self.snapshot_path)
+                self._rotated_sig = None
+                self._journal_id = None
+                self._offset = 0
+                self._loaded = True
+
+    def close(self):
+        self._file_lock.close()
+
+    # ---------------------------------------------------------
+    # IMPLEMENTACIÓN INTERNA
+    # ---------------------------------------------------------
+
+    def _catch_up(self, repair: bool):
+        """
+        Incorpora lo escrito por otros procesos (con _io_lock tomado). Solo
+        se recortan colas a medias con `repair` (bajo _file_lock): sin él,
+        una línea a medias puede ser un añadido de otro proceso en curso.
+        """
+        try:
+            st = os.stat(self.journal_path)
+            journal_id, size = (st.st_dev, st.st_ino), st.st_size
+        except FileNotFoundError:
+            journal_id, size = None, 0
+
+        if (
+            not self._loaded
+            or journal_id != self._journal_id
+            or size < self._offset
+            or _file_sig(self.snapshot_path) != self._snapshot_sig
+            or _file_sig(self.rotated_path) != self._rotated_sig
+        ):
+            self._reload(repair)
+        elif size > self._offset:
+            self._offset = self._replay(self.journal_path, self._state, self._offset, repair)
+
+    def _reload(self, repair: bool):
+        # Firmas tomadas antes de leer: si algo cambia durante la lectura, la
+        # siguiente comprobación lo detecta y se vuelve a leer
+        snapshot_sig = _file_sig(self.snapshot_path)
+        rotated_sig = _file_sig(self.rotated_path)
+        state = self._read_snapshot()
+        self.records = 0
+        self._replay(self.rotated_path, state, 0, repair)
+        try:
+            st = os.stat(self.journal_path)
+            journal_id = (st.st_dev, st.st_ino)
+        except FileNotFoundError:
+            journal_id = None
+        offset = self._replay(self.journal_path, state, 0, repair)
+
+        self._state = state
+        self._snapshot_sig = snapshot_sig
+        self._rotated_sig = rotated_sig
+        self._journal_id = journal_id
+        self._offset = offset
+        self._loaded = True
+
+    def _read_snapshot(self) -> dict:
+        if not os.path.exists(self.snapshot_path):
+            return {}
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            # Snapshot ilegible → se reconstruye lo que haya en el diario
+            logging.warning(f"Snapshot de reproducción ilegible, se usa solo el diario: {e}")
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        state = {}
+        for key, raw in data.items():
+            entry = PlaybackEntry.from_dict(raw)
+            if entry is not None:
+                state[key] = entry
+        return state
+
+    def _replay(self, path: str, state: dict, offset: int, repair: bool) -> int:
+        """Aplica las líneas completas desde `offset`; devuelve hasta dónde leyó."""
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return 0
+        good_offset = offset
+        torn = False
+        with f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    torn = True  # Última línea sin terminar
+                    break
+                try:
+                    record = json.loads(raw.decode("utf-8"))
+                    key, entry = record["path"], record["entry"]
+                except Exception:
+                    torn = True
+                    break
+                self._merge(state, key, PlaybackEntry.from_dict(entry))
+                good_offset += len(raw)
+                if path == self.journal_path:
+                    self.records += 1
+
+        if torn and repair:
+            # Cola a medias de un corte: recortarla para que el próximo
+            # añadido no quede pegado a ella
+            logging.warning(f"Diario de reproducción con una línea incompleta; se descarta: {path}")
+            with open(path, "r+b") as f:
+                f.truncate(good_offset)
+        return good_offset
+
+    def _append(self, accepted: dict):
+        """Añade cambios al diario y al estado (con _io_lock y _file_lock tomados)."""
+        if not accepted:
+            return
+        data = "".join(
+            json.dumps({"path": path, "entry": entry and entry.to_dict()}, ensure_ascii=False) + "\n"
+            for path, entry in accepted.items()
+        )
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(data)
+        for path, entry in accepted.items():
+            self._merge(self._state, path, entry)
+        st = os.stat(self.journal_path)
+        self._journal_id = (st.st_dev, st.st_ino)
+        self._offset = st.st_size
+        self.records += len(accepted)
+        self.appends += 1
+
+    @staticmethod
+    def _merge(state: dict, key: str, entry: Optional[PlaybackEntry]):
+        """Gana el last_seen más reciente; los borrados se aplican en orden."""
+        if entry is None:
+            state.pop(key, None)
+            return
+        current = state.get(key)
+        if current is None or entry.last_seen >= current.last_seen:
+            state[key] = entry
+
+    def _rotate(self):
+        """Con _io_lock y _file_lock tomados."""
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.rotated_path):
+                # Compactación anterior interrumpida: unir ambos diarios
+                with open(self.journal_path, "rb") as src, open(self.rotated_path, "ab") as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.rotated_path)
+        self.records = 0
+        self._rotated_sig = _file_sig(self.rotated_path)
+        self._journal_id = None
+        self._offset = 0
+
+    def _finish_compaction(self, state: dict, rotated_sig):
+        try:
+            with self._file_lock:
+                # Si otro proceso ha rotado o compactado entretanto, el rotado
+                # ya no es el nuestro: dejarlo para la próxima compactación
+                if rotated_sig is None or _file_sig(self.rotated_path) != rotated_sig:
+                    return
+                # `state` ya incluye todo lo del diario rotado
+                self._write_snapshot(state)
+                os.remove(self.rotated_path)
+            logging.info(f"Diario de reproducción compactado ({len(state)} entradas)")
+        except Exception as e:
+            logging.warning(f"No se pudo compactar el estado de reproducción: {e}")
+        finally:
+            self._compact_lock.release()
+
+    def _write_snapshot(self, state: dict):
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({key: entry.to_dict() for key, entry in state.items()}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+
+def _file_sig(path: str):
+    """Identidad + tamaño + mtime de un archivo, o None si no existe."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+_CREATE_TABLE = (
+    "CREATE TABLE {if_not_exists} playback ("
+    " path TEXT PRIMARY KEY,"
+    " position_ms INTEGER NOT NULL,"
+    " duration_ms INTEGER NOT NULL,"
+    " last_seen INTEGER NOT NULL,"   # Segundos epoch: sin ambigüedad con el cambio de hora
+    " media_path TEXT"
+    ") WITHOUT ROWID"
+)
+
+
+class SqliteStore(PlaybackStore):
+    """
+    SQLite en modo WAL: cada lectura es una consulta por clave primaria y
+    cada volcado una transacción con upserts, así que abrir cuesta lo mismo
+    con diez entradas que con cien mil (no se carga nada en memoria).
+
+    - Clave: huella o ruta normalizada (columna path, PRIMARY KEY, tabla
+      WITHOUT ROWID); media_path guarda la última ruta del archivo
+    - last_seen en segundos epoch (INTEGER), indexado para la poda de
+      entradas antiguas; las bases con fechas ISO se convierten al abrir
+    - Si la tabla está vacía y existe el JSON antiguo, se migra una vez
+      (marcado en PRAGMA user_version)
+    - Varios procesos: SQLite serializa las escrituras (BEGIN IMMEDIATE con
+      espera) y el upsert solo sustituye una fila por otra igual o más
+      reciente (last_seen), así que un proceso atrasado no pisa a otro
+    """
+
+    def __init__(self, db_path: str, legacy_snapshot_path: Optional[str] = None):
+        self.db_path = db_path
+        self.legacy_snapshot_path = legacy_snapshot_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()       # Conexión de escritura
+        self._read_lock = threading.Lock()  # Conexión de lectura (WAL: no espera a las escrituras)
+        self.transactions = 0           # Escrituras a disco (métrica)
+
+    # ---------------------------------------------------------
+    # API
+    # ---------------------------------------------------------
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_CREATE_TABLE.format(if_not_exists="IF NOT EXISTS"))
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(playback)")}
+        if "media_path" not in columns:
+            # Bases creadas antes de las claves por huella
+            try:
+                conn.execute("ALTER TABLE playback ADD COLUMN media_path TEXT")
+            except sqlite3.OperationalError:
+                pass  # Otro proceso la añadió a la vez
+        self._conn = conn
+        self._upgrade_last_seen()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_playback_last_seen ON playback(last_seen)")
+        self._read_conn = self._connect()
+        self._migrate_legacy()
+
+    def get(self, path: str) -> Optional[PlaybackEntry]:
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT position_ms, duration_ms, last_seen, media_path FROM playback WHERE path = ?",
+                (path,),
+            ).fetchone()
+        return None if row is None else self._entry(*row)
+
+    def load(self) -> dict:
+        with self._read_lock:
+            rows = self._read_conn.execute(
+                "SELECT path, position_ms, duration_ms, last_seen, media_path FROM playback"
+            ).fetchall()
+        return {row[0]: self._entry(*row[1:]) for row in rows}
+
+    def write(self, changes: dict[str, Optional[PlaybackEntry]]):
+        if not changes:
+            return
+        with self._lock:
+            with self._transaction():
+                self._apply_changes(changes)
+
+    def delete_unchanged(self, expected: dict[str, int]) -> int:
+        if not expected:
+            return 0
+        rows = list(expected.items())
+        with self._lock:
+            with self._transaction():
+                cursor = self._conn.executemany(
+                    "DELETE FROM playback WHERE path = ? AND last_seen = ?", rows
+                )
+        return max(0, cursor.rowcount)
+
+    def replace_all(self, state: dict):
+        # Una sola transacción: nadie ve la tabla vacía a medias
+        with self._lock:
+            with self._transaction():
+                self._conn.execute("DELETE FROM playback")
+                self._apply_changes(state)
+
+    def close(self):
+        with self._lock, self._read_lock:
+            for conn in (self._conn, self._read_conn):
+                if conn is not None:
+                    conn.close()
+            self._conn = self._read_conn = None
+
+    # ---------------------------------------------------------
+    # IMPLEMENTACIÓN INTERNA
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _entry(position_ms, duration_ms, last_seen, media_path) -> PlaybackEntry:
+        return PlaybackEntry(position_ms, duration_ms, last_seen, media_path)
+
+    def _apply_changes(self, changes: dict):
+        """Upserts y borrados (con _lock tomado y dentro de una transacción)."""
+        upserts = [
+            (path, entry.position_ms, entry.duration_ms, int(entry.last_seen), entry.path)
+            for path, entry in changes.items() if entry is not None
+        ]
+        deletes = [(path,) for path, entry in changes.items() if entry is None]
+        if upserts:
+            self._conn.executemany(
+                "INSERT INTO playback(path, position_ms, duration_ms, last_seen, media_path)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(path) DO UPDATE SET"
+                " position_ms = excluded.position_ms,"
+                " duration_ms = excluded.duration_ms,"
+                " last_seen = excluded.last_seen,"
+                " media_path = excluded.media_path"
+                " WHERE excluded.last_seen >= playback.last_seen",
+                upserts,
+            )
+        if deletes:
+            self._conn.executemany("DELETE FROM playback WHERE path = ?", deletes)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            self.db_path, timeout=SQLITE_BUSY_TIMEOUT_S,
+            check_same_thread=False, isolation_level=None,
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """
+        BEGIN IMMEDIATE/COMMIT explícitos (la conexión va en autocommit): el
+        lock de escritura se pide al empezar, y si otro proceso lo tiene se
+        espera hasta SQLITE_BUSY_TIMEOUT_S en lugar de fallar a mitad.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        self.transactions += 1
+
+    def _upgrade_last_seen(self):
+        """
+        Bases anteriores guardaban last_seen como fecha ISO local (TEXT), que
+        se comparaba como texto: tras atrasar el reloj, los guardados de la
+        hora repetida parecían más antiguos y se descartaban. Se pasa a
+        segundos epoch (INTEGER) una vez, reconstruyendo la tabla.
+        """
+        with self._lock:
+            with self._transaction():
+                # Dentro de la transacción: otro proceso puede haberlo hecho ya
+                types = {row[1]: row[2].upper() for row in self._conn.execute("PRAGMA table_info(playback)")}
+                if types.get("last_seen") == "INTEGER":
+                    return
+                rows = self._conn.execute(
+                    "SELECT path, position_ms, duration_ms, last_seen, media_path FROM playback"
+                ).fetchall()
+                self._conn.execute("DROP INDEX IF EXISTS idx_playback_last_seen")
+                self._conn.execute("ALTER TABLE playback RENAME TO playback_text")
+                self._conn.execute(_CREATE_TABLE.format(if_not_exists=""))
+                self._conn.executemany(
+                    "INSERT INTO playback(path, position_ms, duration_ms, last_seen, media_path) VALUES (?, ?, ?, ?, ?)",
+                    [(path, pos, dur, parse_last_seen(seen), media) for path, pos, dur, seen, media in rows],
+                )
+                self._conn.execute("DROP TABLE playback_text")
+        logging.info(f"Estado de reproducción: last_seen pasado a segundos epoch ({len(rows)} entradas)")
+
+    def _migrate_legacy(self):
+        """
+        Migra el JSON antiguo una sola vez, marcándolo en PRAGMA user_version:
+        una tabla vacía después de clear_all o de una poda no debe volver a
+        traer el historial viejo. Las fechas ISO locales del JSON llegan ya
+        como segundos epoch (PlaybackEntry), igual que el resto de la tabla.
+        """
+        if not self.legacy_snapshot_path:
+            return
+        with self._lock:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= LEGACY_MIGRATED_VERSION:
+                return
+        legacy = JournalStore(self.legacy_snapshot_path)
+        state = {}
+        if os.path.exists(legacy.snapshot_path) or os.path.exists(legacy.journal_path):
+            try:
+                state = legacy.load()
+            except Exception as e:
+                logging.warning(f"No se pudo migrar el estado de reproducción antiguo: {e}")
+                return  # Sin marcar: se reintenta en el próximo arranque
+
+        # Comprobación, copia y marca en una transacción: si otro proceso
+        # migra a la vez, solo uno lo hace
+        with self._lock:
+            with self._transaction():
+                if self._conn.execute("PRAGMA user_version").fetchone()[0] >= LEGACY_MIGRATED_VERSION:
+                    return
+                # Bases con filas de antes de esta marca ya se migraron en su día
+                migrate = state and not self._conn.execute("SELECT 1 FROM playback LIMIT 1").fetchone()
+                if migrate:
+                    self._apply_changes(state)
+                self._conn.execute(f"PRAGMA user_version = {LEGACY_MIGRATED_VERSION}")
+        if migrate:
+            logging.info(f"Estado de reproducción migrado a SQLite ({len(state)} entradas)")
+
+
+def open_store(backend: str, snapshot_path: str, db_path: str) -> PlaybackStore:
+    """Crea y abre el almacén indicado: "journal", "sqlite" o "memory"."""
+    if backend == "sqlite":
+        store = SqliteStore(db_path, legacy_snapshot_path=snapshot_path)
+    elif backend == "memory":
+        store = MemoryStore()
+    else:
+        store = JournalStore(snapshot_path)
+    store.open()
+    return store
@@ -1,12 +1,12 @@
 import threading
 import time
-import queue
-import vlc
 import os
 import pathlib
 import logging
 from enum import Enum, auto
 
+from core.command_queue import CommandQueue
+from core.media_folder import next_in_folder
 from core.playback_state import PlaybackState
 
 
@@ -21,27 +21,107 @@ class PlayerState(Enum):
     ERROR = auto()
 
 
+# Cadencia máxima de avisos de tiempo a la UI y de guardado de posición
+# (TimeChanged de VLC puede dispararse decenas de veces por segundo). La UI
+# extrapola entre avisos con su propio reloj, así que bastan pocos.
+TIME_UPDATE_INTERVAL_S = 0.25
+SAVE_POSITION_INTERVAL_S = 1.0
+# Discrepancia entre avance del medio y del reloj que se considera un salto
+SEEK_DETECT_MS = 250
+
+# Límite del análisis asíncrono de pistas (p. ej. archivos en red)
+PARSE_TIMEOUT_MS = 5000
+# Espera máxima a la lectura de la posición guardada al terminar una carga
+# (el almacén puede estar ocupado con una escritura lenta)
+POSITION_LOOKUP_TIMEOUT_S = 0.5
+
+
+def _default_backend():
+    """
+    Backend por defecto: el propio módulo python-vlc. Cualquier objeto con la
+    misma interfaz (Instance, EventType, State, TrackType, MediaParseFlag,
+    MediaParsedStatus) sirve; p. ej. core.fake_vlc.FakeVlc para pruebas sin
+    audio ni pantalla.
+    """
+    import vlc
+    return vlc
+
+
+class _PendingLoad:
+    """
+    Estado de una carga en curso. La carga termina cuando el análisis de
+    pistas y el pre-roll (primer evento Playing) han llegado, en cualquier orden.
+    """
+
+    __slots__ = ("token", "path", "media", "started", "parsed", "playing", "done",
+                 "autoplay", "restore_ms", "has_video", "metrics")
+
+    def __init__(self, token, path, media):
+        self.token = token
+        self.path = path
+        self.media = media          # Mantener viva la referencia mientras haya eventos
+        self.started = time.monotonic()
+        self.parsed = False
+        self.playing = False
+        self.done = False
+        self.autoplay = False       # Play pulsado durante la carga
+        self.restore_ms = 0         # Posición a restaurar cuando sea seekable
+        self.has_video = False
+        self.metrics = {"parse_ms": None, "playing_ms": None, "first_frame_ms": None,
+                        "seekable_ms": None, "loaded_ms": None}
+
+    def elapsed_ms(self) -> int:
+        return int((time.monotonic() - self.started) * 1000)
+
+
 class Player:
-    def __init__(self, tk_root, playback_state: PlaybackState, on_state_change=None, on_time_changed=None, on_media_parsed=None):
+    def __init__(self, tk_root, playback_state: PlaybackState, on_state_change=None, on_time_changed=None, on_media_parsed=None, on_media_loaded=None, on_media_switched=None, prefetch_next=True, backend=None):
         # --- Atributos de integración ---
         self.tk_root = tk_root
         self.playback_state = playback_state
         self.on_state_change = on_state_change
         self.on_time_changed = on_time_changed
         self.on_media_parsed = on_media_parsed
+        self.on_media_loaded = on_media_loaded
+        self.on_media_switched = on_media_switched
 
         # --- Atributos del reproductor VLC ---
-        self.instance = vlc.Instance(["--verbose=-1"])
+        self._vlc = backend if backend is not None else _default_backend()
+        self.instance = self._vlc.Instance(["--verbose=-1"])
         self.media_player = self.instance.media_player_new()
+        # Segundo reproductor (misma instancia) con el siguiente archivo precargado
+        self._next_player = self.instance.media_player_new()
         self._hwnd = None
         self._current_media_path = None
 
         # --- Atributos de estado ---
         self._state = PlayerState.NO_MEDIA
-        self._command_queue = queue.Queue()
+        self._command_queue = CommandQueue()  # set_position/volumen/... colapsan al último
         self._running = True
         self._db_gain = 0.0
         self._monitor_volume_percent = 100
+        self._length_ms = 0
+        self._last_time_update = 0.0
+        self._last_time_ms = 0
+        self._last_position_save = 0.0
+
+        # --- Saltar silencios ---
+        self._speech_index = None
+        self._skip_silence = False
+        self._min_silence_ms = 1500
+
+        # --- Carga asíncrona ---
+        self._load = None
+        self._load_token = 0
+        self.last_load_metrics = None
+
+        # --- Siguiente en la carpeta (precarga) ---
+        self._prefetch_enabled = prefetch_next
+        self._prefetch = None
+
+        # --- Eventos de VLC → cola de comandos ---
+        self._attach_events(self.media_player)
+        self._attach_events(self._next_player)
 
         # --- Hilo de trabajo ---
         self._thread = threading.Thread(target=self._worker_loop, daemon=True)
@@ -67,6 +147,10 @@ class Player:
         self._running = False
         self._command_queue.put(("quit", None))
     
+    def load_next(self):
+        """Pasa al siguiente archivo de la carpeta (instantáneo si está precargado)."""
+        self._command_queue.put(("load_next", None))
+
     def set_position(self, pos):
         self._command_queue.put(('set_position', pos))
 
@@ -76,6 +160,13 @@ class Player:
     def set_volume_percent(self, volume_percent):
         self._command_queue.put(('set_volume', volume_percent))
     
+    def set_speech_index(self, index):
+        """Índice de voz (SpeechIndex) del medio actual, o None."""
+        self._command_queue.put(('set_speech_index', index))
+
+    def set_skip_silence(self, enabled, min_silence_ms):
+        self._command_queue.put(('set_skip_silence', (enabled, min_silence_ms)))
+
     def set_drawable(self, hwnd):
         self._hwnd = hwnd
         self._command_queue.put(('set_drawable', hwnd))
@@ -86,36 +177,26 @@ class Player:
     def get_current_media_path(self):
         return self._current_media_path
 
+    def get_command_stats(self):
+        """Métricas de la cola de comandos (profundidad, descartados...)."""
+        return self._command_queue.stats()
+
     # ---------------------------------------------------------
     # INTERNALS (Lógica principal del hilo de trabajo)
     # ---------------------------------------------------------
 
     def _worker_loop(self):
+        # Sin sondeo: el hilo duerme hasta que llega un comando o un evento de VLC
         while self._running:
+            action, payload = self._command_queue.get()
             try:
-                # Procesar comandos de la cola de prioridad
-                action, payload = self._command_queue.get(timeout=0.25)
                 self._process_command(action, payload)
-            
-            except queue.Empty:
-                # Si no hay comandos, hacer tareas de sondeo
-                if self.media_player:
-                    vlc_state = self.media_player.get_state()
-
-                    # 1. Sondeo de final de archivo
-                    if vlc_state == vlc.State.Ended and self._state != PlayerState.FINISHED:
-                        self._update_state(PlayerState.FINISHED)
-                        # No hacer nada más, esperar a que el usuario pulse Play
-
-                    # 2. Sondeo de tiempo y posición durante la reproducción
-                    elif self._state == PlayerState.PLAYING:
-                        cur = self.media_player.get_time()
-                        total = self.media_player.get_length()
-                        self._update_time(cur, total)
-                        self._save_position()
+            except Exception as e:
+                logging.error(f"Error procesando '{action}': {e}")
 
     def _process_command(self, action, payload):
         if action == "load": self._handle_load(payload)
+        elif action == "load_next": self._handle_load_next()
         elif action == "play": self._handle_play()
         elif action == "pause": self._handle_pause()
         elif action == "stop": self._handle_stop()
@@ -124,50 +205,356 @@ class Player:
         elif action == "set_gain": self._handle_set_gain(payload)
         elif action == "set_volume": self._handle_set_volume(payload)
         elif action == "set_drawable": self._handle_set_drawable(payload)
+        elif action == "set_speech_index": self._speech_index = payload
+        elif action == "set_skip_silence": self._handle_set_skip_silence(payload)
+        # Eventos de VLC (llegan por la misma cola, en orden con los comandos)
+        elif action == "vlc_time": self._handle_time_changed(payload)
+        elif action == "vlc_length": self._length_ms = payload
+        elif action == "vlc_end": self._handle_end_reached()
+        elif action == "vlc_error": self._handle_vlc_error()
+        elif action == "vlc_parsed": self._handle_parsed(payload)
+        elif action == "vlc_playing": self._handle_playing()
+        elif action == "vlc_vout": self._handle_vout(payload)
+        elif action == "vlc_seekable": self._handle_seekable(payload)
+        elif action == "prefetch_parsed": self._handle_prefetch_parsed(payload)
+        elif action == "prefetch_playing": self._handle_prefetch_playing()
             
+    # ---------------------------------------------------------
+    # EVENTOS DE VLC
+    # ---------------------------------------------------------
+
+    def _attach_events(self, media_player):
+        """
+        Los callbacks corren en un hilo interno de libVLC, desde el que no se
+        debe llamar a libVLC: solo encolan el evento para el hilo de trabajo.
+
+        Los dos reproductores se intercambian, así que cada evento se enruta
+        según el papel que tenga su reproductor en ese momento.
+        """
+        def put(action, payload=None):
+            if media_player is self.media_player:
+                self._command_queue.put((action, payload))
+            elif media_player is self._next_player and action == "vlc_playing":
+                self._command_queue.put(("prefetch_playing", None))
+
+        events = media_player.event_manager()
+        events.event_attach(self._vlc.EventType.MediaPlayerTimeChanged, lambda e: put("vlc_time", e.u.new_time))
+        events.event_attach(self._vlc.EventType.MediaPlayerLengthChanged, lambda e: put("vlc_length", e.u.new_length))
+        events.event_attach(self._vlc.EventType.MediaPlayerEndReached, lambda e: put("vlc_end"))
+        events.event_attach(self._vlc.EventType.MediaPlayerEncounteredError, lambda e: put("vlc_error"))
+        events.event_attach(self._vlc.EventType.MediaPlayerPlaying, lambda e: put("vlc_playing"))
+        events.event_attach(self._vlc.EventType.MediaPlayerVout, lambda e: put("vlc_vout", e.u.new_count))
+        events.event_attach(self._vlc.EventType.MediaPlayerSeekableChanged, lambda e: put("vlc_seekable", e.u.new_seekable))
+
+    def _handle_time_changed(self, current_ms):
+        if self._state != PlayerState.PLAYING:
+            return
+        now = time.monotonic()
+        elapsed = now - self._last_time_update
+        # Solo se descartan avisos coherentes con la reproducción continua;
+        # un salto (seek, saltar silencio) se notifica siempre al momento
+        drift_ms = abs((current_ms - self._last_time_ms) - elapsed * 1000)
+        if elapsed < TIME_UPDATE_INTERVAL_S and drift_ms < SEEK_DETECT_MS:
+            return
+        self._last_time_update = now
+        self._last_time_ms = current_ms
+
+        total = self._length_ms or self.media_player.get_length()
+        self._update_time(current_ms, total)
+        if now - self._last_position_save >= SAVE_POSITION_INTERVAL_S:
+            self._last_position_save = now
+            self._save_position()
+        self._maybe_skip_silence(current_ms, total)
+
+    def _handle_end_reached(self):
+        # Esperar a que el usuario pulse Play
+        if self._state in (PlayerState.PLAYING, PlayerState.PAUSED):
+            self._update_state(PlayerState.FINISHED)
+
+    def _handle_vlc_error(self):
+        if self._current_media_path:
+            logging.error(f"VLC no pudo reproducir '{self._current_media_path}'")
+            self._cancel_load()
+            self._update_state(PlayerState.ERROR)
+
+    # ---------------------------------------------------------
+    # CARGA ASÍNCRONA (análisis + pre-roll dirigidos por eventos)
+    # ---------------------------------------------------------
+
+    def _handle_parsed(self, token):
+        load = self._load
+        if load is None or load.token != token or load.parsed:
+            return  # Carga cancelada o sustituida
+        load.parsed = True
+        load.metrics["parse_ms"] = load.elapsed_ms()
+
+        status = load.media.get_parsed_status()
+        if status != self._vlc.MediaParsedStatus.done:
+            logging.warning(f"Análisis incompleto de '{load.path}' ({status}); se continúa sin pistas")
+
+        # Detectar si es video
+        load.has_video = self._detect_video(load.media)
+        self.playback_state.has_video = load.has_video
+        if self.on_media_parsed:
+            self.tk_root.after_idle(self.on_media_parsed)
+        self._maybe_finish_load()
+
+    def _handle_playing(self):
+        load = self._load
+        if load is None or load.done or load.playing:
+            return
+        load.playing = True
+        self.media_player.set_pause(1)  # Fin del pre-roll
+        load.metrics["playing_ms"] = load.elapsed_ms()
+        self._maybe_finish_load()
+
+    def _handle_vout(self, count):
+        load = self._load
+        if load is not None and count > 0 and load.metrics["first_frame_ms"] is None:
+            load.metrics["first_frame_ms"] = load.elapsed_ms()
+
+    def _handle_seekable(self, seekable):
+        load = self._load
+        if load is None or not seekable or load.metrics["seekable_ms"] is not None:
+            return
+        load.metrics["seekable_ms"] = load.elapsed_ms()
+        if load.restore_ms:
+            self._restore_position(load.restore_ms)
+            load.restore_ms = 0
+        if load.done:
+            self._report_load(load)
+
+    def _maybe_finish_load(self):
+        load = self._load
+        if load is None or load.done or not (load.parsed and load.playing):
+            return
+        load.done = True
+        load.metrics["loaded_ms"] = load.elapsed_ms()
+        if load.metrics["first_frame_ms"] is None and not self.playback_state.has_video:
+            load.metrics["first_frame_ms"] = load.metrics["playing_ms"]  # Audio: primer buffer
+
+        # Restaurar posición (en cuanto el medio admita saltos)
+        last_pos = self.playback_state.get_position(load.path, timeout=POSITION_LOOKUP_TIMEOUT_S)
+        if last_pos and last_pos > 0:
+            if self.media_player.is_seekable():
+                self._restore_position(last_pos)
+            else:
+                load.restore_ms = last_pos
+
+        self.media_player.audio_set_mute(False)
+        self._worker_update_final_volume()
+        self._update_state(PlayerState.PAUSED)
+
+        # Carga terminada: la UI puede lanzar el trabajo pesado (picos, etc.)
+        if self.on_media_loaded:
+            self.tk_root.after_idle(self.on_media_loaded, load.path, self._length_ms or self.media_player.get_length())
+
+        if load.metrics["seekable_ms"] is not None:
+            self._report_load(load)
+        if load.autoplay:
+            self._handle_play()
+
+        # Con el archivo listo, precargar el siguiente de la carpeta
+        self._prefetch_next()
+
+    def _cancel_load(self):
+        load = self._load
+        self._load = None
+        if load is None or load.done:
+            return
+        load.media.parse_stop()
+        self.media_player.audio_set_mute(False)
+        logging.info(f"Carga cancelada tras {load.elapsed_ms()} ms: {load.path}")
+
+    def _detect_video(self, media):
+        tracks = media.tracks_get()
+        return any(t.type == self._vlc.TrackType.video for t in tracks or [])
+
+    def _restore_position(self, position_ms):
+        self.media_player.set_time(position_ms)
+        logging.info(f"Posición restaurada: {position_ms} ms")
+
+    def _report_load(self, load):
+        self.last_load_metrics = dict(load.metrics)
+        m = load.metrics
+        logging.info(
+            f"Carga de '{os.path.basename(load.path)}': análisis {m['parse_ms']} ms, "
+            f"primer frame {m['first_frame_ms']} ms, seekable {m['seekable_ms']} ms, "
+            f"lista {m['loaded_ms']} ms"
+        )
+
+    # ---------------------------------------------------------
+    # SIGUIENTE EN LA CARPETA (doble reproductor)
+    # ---------------------------------------------------------
+
+    def _prefetch_next(self):
+        """
+        Prepara el siguiente archivo de la carpeta en el segundo reproductor:
+        crea el medio y lo analiza; si es solo audio, además hace el pre-roll
+        silenciado. (Con video no se hace pre-roll: sin ventana asignada VLC
+        abriría la suya propia.)
+        """
+        if not self._prefetch_enabled or not self._current_media_path:
+            return
+        path = next_in_folder(self._current_media_path)
+        if self._prefetch is not None and path and os.path.normcase(self._prefetch.path) == os.path.normcase(path):
+            return
+        self._drop_prefetch()
+        if path is None:
+            return
+
+        media = self._new_media(path)
+        self._next_player.set_media(media)
+        self._load_token += 1
+        prefetch = _PendingLoad(self._load_token, path, media)
+        self._prefetch = prefetch
+        media.event_manager().event_attach(
+            self._vlc.EventType.MediaParsedChanged,
+            lambda e, token=prefetch.token: self._command_queue.put(("prefetch_parsed", token))
+        )
+        media.parse_with_options(self._vlc.MediaParseFlag.local, PARSE_TIMEOUT_MS)
+        logging.info(f"Precargando siguiente archivo: {path}")
+
+    def _handle_prefetch_parsed(self, token):
+        # Si ya se cambió al precargado antes de terminar el análisis, el
+        # aviso pertenece ahora a la carga en curso
+        if self._load is not None and self._load.token == token:
+            self._handle_parsed(token)
+            return
+        prefetch = self._prefetch
+        if prefetch is None or prefetch.token != token or prefetch.parsed:
+            return
+        prefetch.parsed = True
+        prefetch.metrics["parse_ms"] = prefetch.elapsed_ms()
+        prefetch.has_video = self._detect_video(prefetch.media)
+        status = prefetch.media.get_parsed_status()
+        if status != self._vlc.MediaParsedStatus.done:
+            # Sin pistas no se sabe si es vídeo: un pre-roll abriría una
+            # ventana de VLC aparte (el reproductor siguiente no tiene hwnd).
+            # Arranca al cambiar a él, ya con la ventana asignada.
+            logging.info(f"Análisis incompleto del precargado '{prefetch.path}' ({status}); sin pre-roll")
+            return
+        if not prefetch.has_video:
+            self._next_player.audio_set_mute(True)
+            self._next_player.play()
+
+    def _handle_prefetch_playing(self):
+        prefetch = self._prefetch
+        if prefetch is None or prefetch.playing:
+            return
+        prefetch.playing = True
+        prefetch.metrics["playing_ms"] = prefetch.elapsed_ms()
+        self._next_player.set_pause(1)
+
+    def _drop_prefetch(self):
+        prefetch = self._prefetch
+        self._prefetch = None
+        if prefetch is None:
+            return
+        if not prefetch.parsed:
+            prefetch.media.parse_stop()
+        self._next_player.stop()
+
+    def _handle_load_next(self):
+        path = next_in_folder(self._current_media_path or (self._load.path if self._load else None))
+        if path is None:
+            logging.info("No hay más archivos en la carpeta.")
+            return
+        if self.on_media_switched:
+            self.tk_root.after_idle(self.on_media_switched, path)
+        self._handle_load(path)
+
+    def _switch_to_prefetched(self):
+        """
+        Intercambia los reproductores: el precargado pasa a ser el actual
+        sin volver a crear ni analizar el medio.
+        """
+        prefetch = self._prefetch
+        self._prefetch = None
+        self._save_position()
+        self._cancel_load()
+
+        old_player = self.media_player
+        self.media_player, self._next_player = self._next_player, old_player
+        old_player.stop()
+        if self._hwnd:
+            self.media_player.set_hwnd(self._hwnd)
+
+        self._update_state(PlayerState.LOADING)
+        self._current_media_path = prefetch.path
+        self._length_ms = self.media_player.get_length() if prefetch.playing else 0
+        self._speech_index = None
+        self.playback_state.has_video = prefetch.has_video
+        if self.on_media_parsed:
+            self.tk_root.after_idle(self.on_media_parsed)
+
+        # Reutilizar el pipeline de carga: ya analizado y, si es audio, con pre-roll hecho
+        prefetch.started = time.monotonic()
+        prefetch.metrics = {"parse_ms": 0 if prefetch.parsed else None, "playing_ms": 0 if prefetch.playing else None,
+                            "first_frame_ms": None, "seekable_ms": None, "loaded_ms": None}
+        self._load = prefetch
+        logging.info(f"Cambio instantáneo al archivo precargado: {prefetch.path}")
+        if prefetch.playing:
+            if self.media_player.is_seekable():
+                prefetch.metrics["seekable_ms"] = 0
+            self._maybe_finish_load()
+        else:
+            self.media_player.audio_set_mute(True)
+            self.media_player.play()
+
     # ---------------------------------------------------------
     # COMMAND HANDLERS (Manejadores de acciones)
     # ---------------------------------------------------------
 
     def _handle_load(self, filepath):
+        """
+        Inicia la carga sin bloquear el hilo de trabajo: el análisis de pistas
+        y el pre-roll silenciado avanzan por eventos (_handle_parsed /
+        _handle_playing). Una carga posterior o un stop la cancelan.
+        """
+        if self._prefetch is not None and os.path.normcase(self._prefetch.path) == os.path.normcase(filepath):
+            if os.path.exists(filepath):
+                self._switch_to_prefetched()
+                return
+        self._drop_prefetch()
+
+        self._cancel_load()
         self._update_state(PlayerState.LOADING)
         if not os.path.exists(filepath):
             self._update_state(PlayerState.ERROR)
             return
 
         self._current_media_path = filepath
-        media = self.instance.media_new(pathlib.Path(filepath).as_uri())
-        
-        # Integración de funciones que faltaban
-        media.add_option(":no-hw-decoding")
+        self._length_ms = 0
+        self._speech_index = None  # Se recibe cuando terminen los picos
+        media = self._new_media(filepath)
         if self._hwnd:
             self.media_player.set_hwnd(self._hwnd)
 
         self.media_player.set_media(media)
-        media.parse()
-        
-        # Detectar si es video
-        tracks = media.tracks_get()
-        self.playback_state.has_video = any(t.type == vlc.TrackType.video for t in tracks or [])
-        if self.on_media_parsed:
-            self.tk_root.after_idle(self.on_media_parsed)
 
-        self.media_player.play() # Iniciar y pausar para obtener duración y estado
-        time.sleep(0.05)
-        self.media_player.pause()
-
-        # Restaurar posición
-        last_pos = self.playback_state.get_position(self._current_media_path)
-        if last_pos and last_pos > 0:
-            self.media_player.set_time(last_pos)
-            logging.info(f"Posición restaurada: {last_pos} ms")
-
-        self._worker_update_final_volume()
-        self._update_state(PlayerState.PAUSED)
+        self._load_token += 1
+        load = _PendingLoad(self._load_token, filepath, media)
+        self._load = load
+        media.event_manager().event_attach(
+            self._vlc.EventType.MediaParsedChanged,
+            lambda e, token=load.token: self._command_queue.put(("vlc_parsed", token))
+        )
+        if media.parse_with_options(self._vlc.MediaParseFlag.local, PARSE_TIMEOUT_MS) == -1:
+            logging.warning(f"No se pudo iniciar el análisis de '{filepath}'")
+            self._handle_parsed(load.token)
+
+        # Pre-roll en silencio para obtener duración y primer frame
+        self.media_player.audio_set_mute(True)
+        self.media_player.play()
 
     def _handle_play(self):
+        if self._load is not None and not self._load.done:
+            self._load.autoplay = True  # Se reproduce al terminar la carga
+            return
+
         # Lógica de reinicio robusta
-        if self.media_player.get_state() == vlc.State.Ended:
+        if self.media_player.get_state() == self._vlc.State.Ended:
             self.media_player.stop()
             time.sleep(0.05)
             # set_time(0) es implícito al volver a dar a play tras stop
@@ -176,18 +563,28 @@ class Player:
         self._update_state(PlayerState.PLAYING)
 
     def _handle_pause(self):
+        if self._load is not None and not self._load.done:
+            self._load.autoplay = False
+            return
         self.media_player.pause()
         self._update_state(PlayerState.PAUSED)
 
     def _handle_stop(self):
+        self._cancel_load()
         self._save_position()
         self.media_player.stop()
         self._current_media_path = None
+        self._speech_index = None
         self.playback_state.has_video = False
         self._update_state(PlayerState.STOPPED)
 
     def _handle_quit(self):
         self._running = False
+        logging.info(f"Cola de comandos: {self._command_queue.stats()}")
+        self._save_position()
+        self.playback_state.flush()
+        self._drop_prefetch()
+        self._next_player.release()
         if self.media_player:
             self.media_player.release()
         self.instance.release()
@@ -209,22 +606,43 @@ class Player:
         if self.media_player:
             self.media_player.set_hwnd(hwnd)
 
+    def _handle_set_skip_silence(self, payload):
+        self._skip_silence, self._min_silence_ms = payload
+
     # ---------------------------------------------------------
     # HELPERS (Estado, Tiempo, Volumen)
     # ---------------------------------------------------------
     
+    def _new_media(self, filepath):
+        media = self.instance.media_new(pathlib.Path(filepath).as_uri())
+        # Integración de funciones que faltaban
+        media.add_option(":no-hw-decoding")
+        return media
+
     def _save_position(self):
         if not self._current_media_path or self.media_player is None: return
         try:
             pos = self.media_player.get_time()
+            length = self._length_ms or self.media_player.get_length()
             if pos > 0:
-                self.playback_state.set_position(self._current_media_path, pos)
+                self.playback_state.save_position(self._current_media_path, pos, length)
         except Exception:
             pass
 
+    def _maybe_skip_silence(self, current_ms, total_ms):
+        """Si la posición cae en un silencio largo, saltar al siguiente tramo de voz."""
+        index = self._speech_index
+        if not self._skip_silence or index is None or total_ms <= 0 or current_ms < 0:
+            return
+        target = index.skip_target(current_ms, self._min_silence_ms)
+        if target is not None:
+            logging.debug(f"Saltando silencio: {current_ms} → {target} ms")
+            self._handle_set_position(target / total_ms)
+
     def _update_time(self, current_ms, total_ms):
+        # El instante de la muestra permite a la UI extrapolar sin desfase
         if self.on_time_changed:
-            self.tk_root.after_idle(self.on_time_changed, current_ms, total_ms)
+            self.tk_root.after_idle(self.on_time_changed, current_ms, total_ms, time.monotonic())
 
     def _update_state(self, state):
         if self._state == state:
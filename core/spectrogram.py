@@ -0,0 +1,271 @@
+# core/spectrogram.py
+import concurrent.futures
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from core import peak_cache
+from core.waveform_peaks import (
+    BASE_SAMPLES_PER_BUCKET,
+    count_buckets,
+    decode_samples,
+    get_executor,
+    is_pcm_wav,
+)
+
+# STFT a ~8 kHz: ventana de 32 ms, un frame por bucket del waveform (8 ms),
+# de modo que las columnas del espectrograma y del waveform coinciden.
+N_FFT = 256
+HOP = BASE_SAMPLES_PER_BUCKET
+FREQ_BINS = N_FFT // 2          # Se descarta el bin de Nyquist
+TILE_COLUMNS = 1024             # ~8 s por tile
+DB_FLOOR = -90.0
+DB_CEIL = -10.0
+MEMORY_TILES = 32
+# Tope de tiles en memoria aunque la vista pida más (~384 KB por tile)
+MAX_MEMORY_TILES = 96
+# Hilos que leen y decodifican PNG cacheados (E/S fuera del hilo de Tk)
+IO_WORKERS = 2
+
+
+def _build_palette() -> np.ndarray:
+    """LUT (256, 3) del fondo de la UI al cian del waveform y al blanco."""
+    stops = [
+        (0.00, (0x0B, 0x2A, 0x3A)),
+        (0.45, (0x00, 0x6E, 0x9E)),
+        (0.75, (0x00, 0xC8, 0xFF)),
+        (1.00, (0xFF, 0xFF, 0xFF)),
+    ]
+    x = np.linspace(0.0, 1.0, 256)
+    positions = [p for p, _ in stops]
+    return np.stack(
+        [np.interp(x, positions, [c[channel] for _, c in stops]) for channel in range(3)],
+        axis=1
+    ).astype(np.uint8)
+
+
+PALETTE = _build_palette()
+
+
+# ---------------------------------------------------------
+# CÁLCULO (procesos del pool)
+# ---------------------------------------------------------
+
+def compute_tile(path: str, tile_index: int, total_columns: int, pcm_wav: bool, out_path: str) -> str:
+    """
+    Calcula el tile `tile_index` (STFT con ventana de Hann) y lo guarda como
+    PNG RGB de FREQ_BINS x TILE_COLUMNS en `out_path`. Devuelve la ruta.
+    """
+    first = tile_index * TILE_COLUMNS
+    columns = max(0, min(TILE_COLUMNS, total_columns - first))
+
+    # Frames centrados en cada bucket: medio FFT de margen a cada lado
+    margin_buckets = N_FFT // (2 * HOP)
+    lead = min(first, margin_buckets)
+    samples = decode_samples(path, first - lead, columns + lead + margin_buckets, pcm_wav)
+    if lead < margin_buckets:
+        samples = np.concatenate([np.zeros((margin_buckets - lead) * HOP, dtype=np.float32), samples])
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, N_FFT)[::HOP][:columns]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(N_FFT).astype(np.float32), axis=1))[:, :FREQ_BINS]
+    db = 20.0 * np.log10(spectrum / (N_FFT / 2) + 1e-10)
+
+    levels = np.clip((db - DB_FLOOR) / (DB_CEIL - DB_FLOOR), 0.0, 1.0)
+    indices = np.zeros((FREQ_BINS, TILE_COLUMNS), dtype=np.uint8)
+    # Frecuencias bajas abajo
+    indices[:, :columns] = (levels.T[::-1] * 255).astype(np.uint8)
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp.png"
+    Image.fromarray(PALETTE[indices], "RGB").save(tmp_path)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+# ---------------------------------------------------------
+# GESTOR DE TILES
+# ---------------------------------------------------------
+
+class SpectrogramTiles:
+    """
+    Tiles de espectrograma de un archivo bajo demanda.
+
+    Cada tile se calcula una sola vez en el pool de procesos y se guarda en
+    disco junto a la caché de picos (clave de huella del archivo); después
+    se lee del PNG cacheado en un hilo de E/S y se sirve desde memoria (LRU).
+    El hilo llamante (Tk) nunca toca disco.
+    """
+
+    def __init__(self, on_ready=None):
+        self.on_ready = on_ready
+
+        self._lock = threading.Lock()
+        self._path = None
+        self._key = None
+        self._pcm_wav = False
+        self.total_columns = 0
+        self._tiles = OrderedDict()   # índice -> Image
+        self._capacity = MEMORY_TILES
+        self._pending = {}            # índice -> Future (lectura o cálculo)
+        self._io = concurrent.futures.ThreadPoolExecutor(IO_WORKERS, thread_name_prefix="SpectrogramIO")
+        self._failed = set()          # No reintentar en cada redibujado
+        self._token = 0
+
+    # ---------------------------------------------------------
+    # API PÚBLICA
+    # ---------------------------------------------------------
+
+    def load(self, media_path: str, duration_ms: int = 0):
+        """
+        Prepara el archivo en un hilo aparte (huella, formato y duración
+        tocan disco, y puede ser una unidad de red); no calcula tiles hasta
+        que se pidan. `on_ready` avisa cuando ya se pueden pedir.
+        """
+        with self._lock:
+            self._reset()
+            token = self._token
+        threading.Thread(
+            target=self._prepare, args=(token, media_path, duration_ms),
+            name="SpectrogramPrepare", daemon=True
+        ).start()
+
+    def reserve(self, count: int):
+        """Ajusta la LRU en memoria a los tiles visibles (con tope MAX_MEMORY_TILES)."""
+        with self._lock:
+            self._capacity = max(MEMORY_TILES, min(count, MAX_MEMORY_TILES))
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def is_ready(self) -> bool:
+        return self._path is not None and self._key is not None and self.total_columns > 0
+
+    def tile_count(self) -> int:
+        return (self.total_columns + TILE_COLUMNS - 1) // TILE_COLUMNS
+
+    def get_tile(self, index: int):
+        """
+        Devuelve el tile como PIL.Image si ya está en memoria, o None. Los que
+        faltan se piden en segundo plano (leer el PNG cacheado o calcularlo)
+        y `on_ready` avisa cuando están listos.
+        """
+        with self._lock:
+            if not self.is_ready() or not 0 <= index < self.tile_count():
+                return None
+
+            tile = self._tiles.get(index)
+            if tile is not None:
+                self._tiles.move_to_end(index)
+                return tile
+
+            if index not in self._pending and index not in self._failed:
+                self._pending[index] = self._io.submit(self._read_tile, self._token, index, True)
+            return None
+
+    # ---------------------------------------------------------
+    # IMPLEMENTACIÓN INTERNA
+    # ---------------------------------------------------------
+
+    def _prepare(self, token, media_path, duration_ms):
+        try:
+            key = peak_cache.cache_key(media_path)
+            pcm_wav = is_pcm_wav(media_path)
+            total_columns = count_buckets(media_path, duration_ms, pcm_wav)
+        except Exception as e:
+            logging.warning(f"Espectrograma no disponible para '{media_path}': {e}")
+            return
+
+        with self._lock:
+            if token != self._token:
+                return  # Otro archivo cargado entretanto
+            self._key = key
+            self._pcm_wav = pcm_wav
+            self.total_columns = total_columns
+            self._path = media_path
+
+        if self.on_ready:
+            self.on_ready()
+
+    def _reset(self):
+        self._token += 1
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._failed.clear()
+        self._tiles.clear()
+        self._path = None
+        self._key = None
+        self.total_columns = 0
+
+    def _tile_path(self, index):
+        return os.path.join(peak_cache.spectrogram_dir(self._key), f"{index:06d}.png")
+
+    def _remember(self, index, tile):
+        self._tiles[index] = tile
+        while len(self._tiles) > self._capacity:
+            self._tiles.popitem(last=False)
+
+    def _read_tile(self, token, index, compute):
+        """
+        Hilo de E/S: carga el PNG cacheado en memoria. Si no existe (o está
+        corrupto) y `compute`, lo encarga al pool de procesos.
+        """
+        with self._lock:
+            if token != self._token:
+                return
+            tile_path = self._tile_path(index)
+            args = (self._path, index, self.total_columns, self._pcm_wav, tile_path)
+
+        tile = None
+        if os.path.exists(tile_path):
+            try:
+                with Image.open(tile_path) as img:
+                    tile = img.convert("RGB")
+            except Exception:
+                pass  # PNG corrupto → recalcular
+
+        future = None
+        with self._lock:
+            if token != self._token:
+                return
+            if tile is not None:
+                self._pending.pop(index, None)
+                self._remember(index, tile)
+            elif compute:
+                future = get_executor().submit(compute_tile, *args)
+                self._pending[index] = future
+            else:
+                self._pending.pop(index, None)
+                self._failed.add(index)
+                return
+
+        if future is not None:
+            # Fuera del lock: si ya terminó, el callback se ejecuta aquí mismo
+            future.add_done_callback(lambda f: self._on_tile_done(f, token, index))
+        elif self.on_ready:
+            self.on_ready()
+
+    def _on_tile_done(self, future, token, index):
+        if future.cancelled():
+            return
+        try:
+            future.result()
+            failed = False
+        except Exception as e:
+            logging.warning(f"No se pudo calcular el tile {index} del espectrograma: {e}")
+            failed = True
+
+        with self._lock:
+            if token != self._token:
+                return
+            if failed:
+                self._pending.pop(index, None)
+                self._failed.add(index)
+                return
+            # Decodificar el PNG recién escrito también en el hilo de E/S
+            self._pending[index] = self._io.submit(self._read_tile, token, index, False)
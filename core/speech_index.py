@@ -0,0 +1,96 @@
+# core/speech_index.py
+import numpy as np
+
+from core.waveform_peaks import PEAK_RMS
+
+# Detección de voz por energía sobre el RMS del nivel base de picos (~8 ms)
+NOISE_PERCENTILE = 10        # Percentil del RMS tomado como ruido de fondo
+SPEECH_MARGIN_DB = 12.0      # Voz = ruido de fondo + margen
+MIN_THRESHOLD_DB = -55.0     # Nunca considerar voz por debajo de esto
+MERGE_GAP_BUCKETS = 40       # Pausas < ~320 ms no cortan un tramo de voz
+MIN_SPEECH_BUCKETS = 12      # Tramos < ~100 ms se descartan (clics, golpes)
+
+# Al saltar un silencio se entra un poco antes de la voz para no cortarla
+PREROLL_MS = 200
+# Saltos más cortos que esto no compensan el corte de audio
+MIN_JUMP_MS = 300
+
+
+def compute_speech_intervals(base_peaks: np.ndarray) -> np.ndarray:
+    """
+    Índice de actividad de voz: array (n, 2) int32 de tramos [inicio, fin)
+    en buckets del nivel base, ordenados y sin solapes.
+    """
+    if len(base_peaks) == 0:
+        return np.zeros((0, 2), dtype=np.int32)
+
+    rms_db = 20.0 * np.log10(np.asarray(base_peaks[:, PEAK_RMS], dtype=np.float32) + 1e-6)
+    threshold = max(MIN_THRESHOLD_DB, float(np.percentile(rms_db, NOISE_PERCENTILE)) + SPEECH_MARGIN_DB)
+
+    starts, ends = _runs(rms_db > threshold)
+
+    # Unir tramos separados por pausas cortas
+    if len(starts) > 1:
+        keep = (starts[1:] - ends[:-1]) >= MERGE_GAP_BUCKETS
+        starts = np.concatenate([starts[:1], starts[1:][keep]])
+        ends = np.concatenate([ends[:-1][keep], ends[-1:]])
+
+    # Descartar tramos demasiado cortos
+    long_enough = (ends - starts) >= MIN_SPEECH_BUCKETS
+    return np.stack([starts[long_enough], ends[long_enough]], axis=1).astype(np.int32)
+
+
+def _runs(mask: np.ndarray):
+    """Inicios y finales [inicio, fin) de las rachas True de una máscara (vectorizado)."""
+    edges = np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class SpeechIndex:
+    """
+    Tramos de voz de un archivo en milisegundos, con búsquedas binarias
+    (np.searchsorted) para decidir si una posición cae en un silencio.
+    """
+
+    __slots__ = ("starts_ms", "ends_ms", "duration_ms")
+
+    def __init__(self, starts_ms: np.ndarray, ends_ms: np.ndarray, duration_ms: int):
+        self.starts_ms = starts_ms
+        self.ends_ms = ends_ms
+        self.duration_ms = duration_ms
+
+    @classmethod
+    def from_buckets(cls, intervals: np.ndarray, total_buckets: int, duration_ms: int):
+        """Convierte tramos en buckets a ms usando la duración real del medio."""
+        bucket_ms = duration_ms / total_buckets if total_buckets else 0.0
+        ms = (np.asarray(intervals, dtype=np.float64) * bucket_ms).astype(np.int64)
+        return cls(ms[:, 0].copy(), ms[:, 1].copy(), duration_ms)
+
+    def __len__(self):
+        return len(self.starts_ms)
+
+    def is_speech(self, position_ms: int) -> bool:
+        i = int(np.searchsorted(self.ends_ms, position_ms, side="right"))
+        return i < len(self.starts_ms) and self.starts_ms[i] <= position_ms
+
+    def skip_target(self, position_ms: int, min_silence_ms: int):
+        """
+        Si `position_ms` cae dentro de un silencio de al menos `min_silence_ms`,
+        devuelve la posición (ms) a la que saltar; si no, None.
+        El silencio final del archivo no se salta.
+        """
+        i = int(np.searchsorted(self.ends_ms, position_ms, side="right"))
+        if i >= len(self.starts_ms):
+            return None
+        next_start = int(self.starts_ms[i])
+        if next_start <= position_ms:
+            return None  # Dentro de un tramo de voz
+
+        silence_start = int(self.ends_ms[i - 1]) if i > 0 else 0
+        if next_start - silence_start < min_silence_ms:
+            return None
+
+        target = max(position_ms, next_start - PREROLL_MS)
+        if target - position_ms < MIN_JUMP_MS:
+            return None
+        return target
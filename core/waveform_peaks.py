@@ -0,0 +1,742 @@
+# core/waveform_peaks.py
+import concurrent.futures
+import logging
+import math
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import wave
+
+import numpy as np
+
+from core import peak_cache
+
+
+# Frecuencia nominal del envolvente: suficiente para distinguir voz y silencio
+PEAK_SAMPLE_RATE = 8000
+# Muestras (a PEAK_SAMPLE_RATE) por bucket del nivel base de la pirámide → 8 ms
+BASE_SAMPLES_PER_BUCKET = 64
+# Cada nivel agrupa PYRAMID_FACTOR buckets del anterior: 64 / 256 / 1024 / 4096
+PYRAMID_FACTOR = 4
+PYRAMID_LEVELS = 4
+# Zoom por defecto del waveform (muestras por píxel) → ~32 ms por píxel
+DEFAULT_SAMPLES_PER_PIXEL = 256
+# Buckets procesados por bloque al leer el WAV (acota la memoria usada)
+_BLOCK_BUCKETS = 4096
+# Tamaño de los trozos del cálculo progresivo (múltiplos del bucket más grueso).
+# Los WAV se leen muy rápido; el resto paga el arranque de VLC por trozo.
+WAV_CHUNK_BUCKETS = 4096        # ~33 s
+TRANSCODE_CHUNK_BUCKETS = 16384 # ~2 min
+
+# Columnas del array de picos
+PEAK_MIN, PEAK_MAX, PEAK_RMS = 0, 1, 2
+
+
+# ---------------------------------------------------------
+# DECODIFICACIÓN
+# ---------------------------------------------------------
+
+def compute_peaks(path: str) -> np.ndarray:
+    """
+    Decodifica el audio del archivo una sola vez y devuelve el nivel base
+    de picos: array (n_buckets, 3) float32 con min / max / RMS por bucket.
+    """
+    return compute_chunk(path, 0, None, is_pcm_wav(path))
+
+
+def compute_chunk(path: str, first_bucket: int, n_buckets, pcm_wav: bool) -> np.ndarray:
+    """
+    Calcula el nivel base de picos para el rango [first_bucket, first_bucket + n_buckets).
+    `n_buckets=None` llega hasta el final del archivo.
+
+    Los WAV PCM se leen directamente; cualquier otro formato se transcodifica
+    antes a un WAV temporal mono de 8 kHz usando VLC.
+    """
+    if pcm_wav:
+        return _peaks_from_wav(path, first_bucket, n_buckets)
+
+    bucket_s = BASE_SAMPLES_PER_BUCKET / PEAK_SAMPLE_RATE
+    start_s = first_bucket * bucket_s
+    stop_s = (first_bucket + n_buckets) * bucket_s if n_buckets else None
+
+    tmp_path = _transcode_with_vlc(path, start_s, stop_s)
+    try:
+        peaks = _peaks_from_wav(tmp_path)
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    # El recorte de VLC no es exacto a la muestra: ajustar al rango pedido
+    if n_buckets is not None and len(peaks) != n_buckets:
+        fitted = np.zeros((n_buckets, 3), dtype=np.float32)
+        count = min(n_buckets, len(peaks))
+        fitted[:count] = peaks[:count]
+        peaks = fitted
+    return peaks
+
+
+def decode_samples(path: str, first_bucket: int, n_buckets: int, pcm_wav: bool) -> np.ndarray:
+    """
+    Muestras mono float32 del rango de buckets, remuestreadas a
+    BASE_SAMPLES_PER_BUCKET por bucket (~PEAK_SAMPLE_RATE). Siempre devuelve
+    exactamente n_buckets * BASE_SAMPLES_PER_BUCKET muestras (con ceros al final).
+    """
+    n_out = n_buckets * BASE_SAMPLES_PER_BUCKET
+
+    if pcm_wav:
+        with wave.open(path, "rb") as wav:
+            frames_per_bucket = _frames_per_bucket(wav.getframerate())
+            start_frame = first_bucket * frames_per_bucket
+            if start_frame < wav.getnframes():
+                wav.setpos(start_frame)
+                raw = wav.readframes(n_buckets * frames_per_bucket)
+            else:
+                raw = b""
+            samples = _pcm_to_mono(raw, wav.getsampwidth(), wav.getnchannels())
+        samples = _resample(samples, frames_per_bucket / BASE_SAMPLES_PER_BUCKET)
+    else:
+        bucket_s = BASE_SAMPLES_PER_BUCKET / PEAK_SAMPLE_RATE
+        tmp_path = _transcode_with_vlc(path, first_bucket * bucket_s, (first_bucket + n_buckets) * bucket_s)
+        try:
+            with wave.open(tmp_path, "rb") as wav:
+                samples = _pcm_to_mono(wav.readframes(wav.getnframes()), wav.getsampwidth(), wav.getnchannels())
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    out = np.zeros(n_out, dtype=np.float32)
+    count = min(n_out, len(samples))
+    out[:count] = samples[:count]
+    return out
+
+
+def _resample(samples: np.ndarray, ratio: float) -> np.ndarray:
+    """Remuestreo simple (media móvil como paso bajo + interpolación lineal)."""
+    if ratio == 1.0 or len(samples) == 0:
+        return samples
+    width = int(round(ratio))
+    if width > 1:
+        csum = np.cumsum(np.concatenate([np.zeros(1, dtype=np.float64), samples]))
+        samples = ((csum[width:] - csum[:-width]) / width).astype(np.float32)
+    positions = np.arange(int(len(samples) / ratio)) * ratio
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def compute_chunk_pyramid(path: str, first_bucket: int, n_buckets: int, pcm_wav: bool) -> list[np.ndarray]:
+    """
+    Punto de entrada de los procesos del pool: picos de un trozo ya reducidos
+    a todos los niveles de la pirámide (el trozo está alineado al nivel más grueso).
+    """
+    return build_pyramid(compute_chunk(path, first_bucket, n_buckets, pcm_wav))
+
+
+def is_pcm_wav(path: str) -> bool:
+    if not path.lower().endswith(".wav"):
+        return False
+    try:
+        # wave.open rechaza los WAV no PCM (float, ADPCM...) → los decodifica VLC
+        with wave.open(path, "rb"):
+            return True
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def count_buckets(path: str, duration_ms: int, pcm_wav: bool) -> int:
+    """Número total de buckets del nivel base para el archivo."""
+    if pcm_wav:
+        with wave.open(path, "rb") as wav:
+            return math.ceil(wav.getnframes() / _frames_per_bucket(wav.getframerate()))
+    bucket_ms = BASE_SAMPLES_PER_BUCKET * 1000 / PEAK_SAMPLE_RATE
+    return math.ceil(max(0, duration_ms) / bucket_ms)
+
+
+def _frames_per_bucket(rate: int) -> int:
+    # Frames nativos por bucket: la posición se mapea por fracción de la
+    # duración, así que basta con que todos los buckets sean iguales.
+    return max(1, round(rate * BASE_SAMPLES_PER_BUCKET / PEAK_SAMPLE_RATE))
+
+
+def _peaks_from_wav(path: str, first_bucket: int = 0, n_buckets=None) -> np.ndarray:
+    with wave.open(path, "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        frames_per_bucket = _frames_per_bucket(wav.getframerate())
+        block_frames = frames_per_bucket * _BLOCK_BUCKETS
+
+        start_frame = first_bucket * frames_per_bucket
+        if start_frame >= wav.getnframes():
+            return np.zeros((n_buckets or 0, 3), dtype=np.float32)
+        wav.setpos(start_frame)
+
+        remaining = n_buckets * frames_per_bucket if n_buckets is not None else None
+        blocks = []
+        while remaining is None or remaining > 0:
+            count = block_frames if remaining is None else min(block_frames, remaining)
+            raw = wav.readframes(count)
+            if not raw:
+                break
+            samples = _pcm_to_mono(raw, width, channels)
+            blocks.append(_reduce_block(samples, frames_per_bucket))
+            if remaining is not None:
+                remaining -= count
+
+    if not blocks:
+        return np.zeros((0, 3), dtype=np.float32)
+    return np.concatenate(blocks)
+
+
+def _pcm_to_mono(raw: bytes, width: int, channels: int) -> np.ndarray:
+    """Convierte PCM entrelazado a float32 mono en [-1, 1]."""
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Ancho de muestra no soportado: {width}")
+
+    if channels > 1:
+        usable = len(data) - len(data) % channels
+        data = data[:usable].reshape(-1, channels).mean(axis=1)
+    return data
+
+
+def _reduce_block(samples: np.ndarray, frames_per_bucket: int) -> np.ndarray:
+    """Reduce un bloque de muestras a min / max / RMS por bucket (vectorizado)."""
+    remainder = len(samples) % frames_per_bucket
+    if remainder:
+        samples = np.concatenate([samples, np.zeros(frames_per_bucket - remainder, dtype=np.float32)])
+
+    buckets = samples.reshape(-1, frames_per_bucket)
+    out = np.empty((buckets.shape[0], 3), dtype=np.float32)
+    out[:, PEAK_MIN] = buckets.min(axis=1)
+    out[:, PEAK_MAX] = buckets.max(axis=1)
+    out[:, PEAK_RMS] = np.sqrt(np.mean(np.square(buckets), axis=1))
+    return out
+
+
+def build_pyramid(base: np.ndarray) -> list[np.ndarray]:
+    """
+    Construye la pirámide de picos (tipo mip-map) a partir del nivel base.
+    Cada nivel reduce PYRAMID_FACTOR buckets del anterior sin volver a tocar
+    las muestras originales.
+    """
+    levels = [base]
+    for _ in range(PYRAMID_LEVELS - 1):
+        prev = levels[-1]
+        remainder = len(prev) % PYRAMID_FACTOR
+        if remainder:
+            pad = np.zeros((PYRAMID_FACTOR - remainder, 3), dtype=np.float32)
+            prev = np.concatenate([prev, pad])
+
+        groups = prev.reshape(-1, PYRAMID_FACTOR, 3)
+        level = np.empty((groups.shape[0], 3), dtype=np.float32)
+        level[:, PEAK_MIN] = groups[:, :, PEAK_MIN].min(axis=1)
+        level[:, PEAK_MAX] = groups[:, :, PEAK_MAX].max(axis=1)
+        level[:, PEAK_RMS] = np.sqrt(np.mean(np.square(groups[:, :, PEAK_RMS]), axis=1))
+        levels.append(level)
+    return levels
+
+
+def _transcode_with_vlc(path: str, start_s=None, stop_s=None, timeout_s: float = 600.0) -> str:
+    """
+    Transcodifica la pista de audio (o el tramo [start_s, stop_s]) a un WAV
+    temporal (s16 mono 8 kHz).
+    La salida por `sout` no está sincronizada con el reloj, por lo que
+    corre mucho más rápido que tiempo real.
+    """
+    import vlc
+
+    fd, tmp_path = tempfile.mkstemp(prefix="transcribe_peaks_", suffix=".wav")
+    os.close(fd)
+
+    # VLC interpreta '\' dentro de la cadena sout; Windows acepta '/'
+    dst = tmp_path.replace("\\", "/")
+    sout = (
+        f"#transcode{{vcodec=none,acodec=s16l,channels=1,samplerate={PEAK_SAMPLE_RATE}}}"
+        f":std{{access=file,mux=wav,dst=\"{dst}\"}}"
+    )
+
+    instance = vlc.Instance(["--verbose=-1", "--no-video"])
+    player = instance.media_player_new()
+    try:
+        media = instance.media_new(pathlib.Path(path).as_uri())
+        media.add_option(f":sout={sout}")
+        media.add_option(":no-sout-video")
+        if start_s:
+            media.add_option(f":start-time={start_s:.3f}")
+        if stop_s:
+            media.add_option(f":stop-time={stop_s:.3f}")
+        player.set_media(media)
+        player.play()
+
+        deadline = time.monotonic() + timeout_s
+        done_states = (vlc.State.Ended, vlc.State.Error, vlc.State.Stopped)
+        while player.get_state() not in done_states:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Transcodificación demasiado lenta: {path}")
+            time.sleep(0.05)
+
+        if player.get_state() == vlc.State.Error:
+            raise RuntimeError(f"VLC no pudo decodificar el audio de {path}")
+    finally:
+        player.stop()
+        player.release()
+        instance.release()
+
+    return tmp_path
+
+
+# ---------------------------------------------------------
+# POOL DE PROCESOS
+# ---------------------------------------------------------
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Pool compartido para el trabajo pesado de audio. Corre en procesos aparte
+    para no competir por el GIL con Tk ni con el hilo del Player.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+            _executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# ---------------------------------------------------------
+# MOTOR DE PICOS
+# ---------------------------------------------------------
+
+class _PeakLevel:
+    __slots__ = ("samples_per_bucket", "peaks", "envelope")
+
+    def __init__(self, samples_per_bucket, peaks, envelope):
+        self.samples_per_bucket = samples_per_bucket
+        self.peaks = peaks          # (n, 3) float32: min / max / RMS
+        self.envelope = envelope    # (n,) float32: max(|min|, |max|), sin normalizar
+
+
+# Estado de WaveformPeaks.status()
+STATUS_EMPTY = "empty"              # Nada cargado (o vídeo)
+STATUS_CALCULATING = "calculating"  # Carga en curso, aún sin ningún trozo
+STATUS_UNAVAILABLE = "unavailable"  # No se pudo decodificar el audio
+STATUS_READY = "ready"              # Hay picos reales (quizá incompletos)
+
+
+class WaveformPeaks:
+    """
+    Fuente de datos real para WaveformCanvas.
+
+    Expone la misma API de ventana que WaveformSimulator (`get_window`).
+    Mientras no hay picos calculados devuelve una ventana plana, nunca datos
+    inventados; `status()` indica si se están calculando o no se pudieron
+    obtener, para que el canvas lo muestre.
+
+    Los picos se guardan como una pirámide multirresolución: cualquier zoom
+    se sirve eligiendo el nivel más cercano y recortándolo, con coste
+    O(ancho) por frame independientemente de la duración del archivo.
+
+    Sin caché, el cálculo se reparte en trozos en un ProcessPoolExecutor,
+    empezando por la posición de reproducción; `on_ready` se llama con cada
+    trozo terminado para que el canvas dibuje lo que ya está disponible.
+    La amplitud se normaliza por el pico máximo de todo el archivo, así que
+    durante el cálculo la forma de onda puede reescalarse al llegar un trozo
+    más fuerte.
+    """
+
+    def __init__(self, on_ready=None):
+        self.on_ready = on_ready
+
+        self._lock = threading.Lock()
+        self._levels = None         # list[_PeakLevel], del más fino al más grueso
+        self._scale = 1.0           # 1 / pico máximo conocido
+        self._peak_max = 0.0
+        self._chunks_done = 0
+        self._chunks_failed = 0
+        self._chunks_total = 0
+        self._loading = False       # load() en curso (aún sin ningún trozo)
+        self._failed = False        # Audio no decodificable
+        self._futures = []
+        self._token = 0             # Invalida cálculos obsoletos
+        self.version = 0            # Cambia con cada dato nuevo (clave de cachés de render)
+        self._speech = None         # Índice de voz (n, 2) en buckets, al completar
+
+        # Buffers de salida reutilizables (ver get_window / get_columns)
+        self._out = np.zeros(0, dtype=np.float32)
+        self._view = None
+        self._edges = np.zeros(0, dtype=np.int64)
+        self._edges_f = np.zeros(0, dtype=np.float64)
+        self._ramp = np.zeros(0, dtype=np.float64)
+
+    # ---------------------------------------------------------
+    # API PÚBLICA
+    # ---------------------------------------------------------
+
+    def load(self, media_path: str, duration_ms: int = 0, position: float = 0.0):
+        """
+        Carga los picos del archivo: desde la caché si existe, si no en trozos
+        en segundo plano priorizando los cercanos a `position` (0.0 - 1.0).
+        """
+        with self._lock:
+            token = self._reset()
+            self._loading = True
+
+        threading.Thread(
+            target=self._load_worker,
+            args=(media_path, duration_ms, position, token),
+            daemon=True
+        ).start()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def set_pyramid(self, pyramid: list[np.ndarray], token=None) -> bool:
+        """
+        Instala una pirámide completa (caché en disco, pruebas de rendimiento).
+        Con `token`, se descarta si entretanto empezó otra carga.
+        """
+        with self._lock:
+            if token is not None and token != self._token:
+                return False
+            self._levels = self._make_levels(pyramid)
+            self._scale = self._scale_for(self._levels[0].envelope)
+            self._chunks_done = self._chunks_total = 1
+            self.version += 1
+            return True
+
+    def is_ready(self) -> bool:
+        return self._levels is not None and self._chunks_done > self._chunks_failed
+
+    def status(self) -> str:
+        """STATUS_EMPTY, STATUS_CALCULATING, STATUS_UNAVAILABLE o STATUS_READY."""
+        if self.is_ready():
+            return STATUS_READY
+        if self._failed:
+            return STATUS_UNAVAILABLE
+        return STATUS_CALCULATING if self._loading else STATUS_EMPTY
+
+    def is_complete(self) -> bool:
+        return self._levels is not None and self._chunks_done >= self._chunks_total
+
+    def get_speech_intervals(self):
+        """Tramos de voz (n, 2) en buckets del nivel base, o None si aún no hay."""
+        return self._speech
+
+    def total_buckets(self) -> int:
+        levels = self._levels
+        return len(levels[0].peaks) if levels else 0
+
+    def get_peaks(self):
+        """Nivel base (n, 3) min / max / RMS, o None si aún no está disponible."""
+        levels = self._levels
+        return levels[0].peaks if levels else None
+
+    def get_window(self, position: float, width: int, samples_per_pixel: int = DEFAULT_SAMPLES_PER_PIXEL):
+        """
+        Devuelve `width` amplitudes reales alrededor de la posición (0.0 - 1.0),
+        con la misma geometría de ventana que WaveformSimulator.
+
+        `samples_per_pixel` fija el zoom (muestras a PEAK_SAMPLE_RATE por columna).
+        Los tramos aún no calculados se devuelven como silencio, y sin picos
+        (ver `status()`) la ventana entera es plana.
+
+        El resultado es una vista de solo lectura sobre un buffer interno,
+        válida hasta la siguiente llamada: en régimen estable no se asigna
+        memoria por frame.
+        """
+        if not self.is_ready():
+            self._output_view(width)
+            self._out[:width] = 0.0
+            return self._view
+
+        start = self.window_start(position, width, samples_per_pixel)
+        filled = len(self.get_columns(start, width, samples_per_pixel))
+        self._out[filled:width] = 0.0
+        return self._output_view(width)
+
+    def total_columns(self, samples_per_pixel: int) -> int:
+        """Ancho en píxeles del archivo completo con ese zoom."""
+        levels = self._levels
+        if not levels:
+            return 0
+        return int(len(levels[0].envelope) * BASE_SAMPLES_PER_BUCKET / samples_per_pixel)
+
+    def window_start(self, position: float, width: int, samples_per_pixel: int) -> int:
+        """Primera columna (absoluta) de la ventana visible para la posición."""
+        total_px = self.total_columns(samples_per_pixel)
+
+        position = max(0.0, min(1.0, position))
+        center_px = int(position * total_px)
+
+        start = center_px - width // 4
+        end = start + width
+
+        if start < 0:
+            start = 0
+            end = width
+
+        if end > total_px:
+            end = total_px
+            start = max(0, end - width)
+        return start
+
+    def get_columns(self, start: int, count: int, samples_per_pixel: int) -> np.ndarray:
+        """
+        Amplitudes normalizadas [0, 1] de las columnas absolutas
+        [start, start + count) con ese zoom (puede devolver menos al final).
+
+        Escribe en el buffer de salida compartido: la vista devuelta es válida
+        hasta la siguiente llamada a get_columns / get_window.
+        """
+        levels = self._levels
+        if not levels:
+            return self._out[:0]
+        if len(self._out) < count:
+            self._out = np.zeros(count, dtype=np.float32)
+            self._view = None
+
+        # Nivel más grueso que todavía tiene al menos un bucket por píxel
+        level = levels[0]
+        for candidate in levels:
+            if candidate.samples_per_bucket <= samples_per_pixel:
+                level = candidate
+
+        envelope = level.envelope
+        ratio = samples_per_pixel / level.samples_per_bucket   # buckets por píxel
+        end = min(start + count, int(len(envelope) / ratio))
+        if end <= start:
+            return self._out[:0]
+
+        out = self._out[:end - start]
+        if ratio == 1.0:
+            np.multiply(envelope[start:end], self._scale, out=out)
+        else:
+            # Bordes de cada píxel en buckets del nivel: O(ancho · ratio). Dentro
+            # de la pirámide ratio < PYRAMID_FACTOR; por encima del nivel más
+            # grueso (4096) crece hasta 16 con el zoom máximo (65536 muestras/px)
+            edges = self._pixel_edges(start, end, ratio, len(envelope))
+            # Con zoom < 1 bucket por píxel el último borde puede repetirse
+            lo, hi = int(edges[0]), max(int(edges[-1]), int(edges[-2]) + 1)
+            edges -= lo
+            np.maximum.reduceat(envelope[lo:hi], edges[:-1], out=out)
+            out *= self._scale
+        return out
+
+    def _pixel_edges(self, start, end, ratio, limit):
+        """Bordes de los píxeles [start, end] en buckets del nivel, sobre un buffer reutilizable."""
+        count = end - start + 1
+        if len(self._edges) < count:
+            self._edges = np.zeros(count, dtype=np.int64)
+            self._edges_f = np.zeros(count, dtype=np.float64)
+            self._ramp = np.arange(count, dtype=np.float64)
+        edges, edges_f = self._edges[:count], self._edges_f[:count]
+        # floor((start + i) * ratio) sin arrays temporales
+        np.add(self._ramp[:count], start, out=edges_f)
+        np.multiply(edges_f, ratio, out=edges_f)
+        np.minimum(edges_f, limit, out=edges_f)
+        np.copyto(edges, edges_f, casting="unsafe")
+        return edges
+
+    def _output_view(self, width):
+        """
+        Vista de solo lectura de `width` elementos sobre el buffer de salida.
+        Se reutiliza mientras el ancho no cambie.
+        """
+        if self._view is not None and len(self._view) == width:
+            return self._view
+
+        if len(self._out) < width:
+            self._out = np.zeros(width, dtype=np.float32)
+        self._view = self._out[:width]
+        self._view.flags.writeable = False
+        return self._view
+
+    # ---------------------------------------------------------
+    # IMPLEMENTACIÓN INTERNA
+    # ---------------------------------------------------------
+
+    def _reset(self):
+        """Cancela el cálculo en curso. Debe llamarse con el lock tomado."""
+        self._token += 1
+        self.version += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        self._levels = None
+        self._scale = 1.0
+        self._peak_max = 0.0
+        self._chunks_done = 0
+        self._chunks_failed = 0
+        self._chunks_total = 0
+        self._loading = False
+        self._failed = False
+        self._speech = None
+        return self._token
+
+    def _mark_failed(self, token):
+        with self._lock:
+            if token != self._token:
+                return
+            self._failed = True
+            self.version += 1
+        if self.on_ready:
+            self.on_ready()
+
+    def _load_worker(self, media_path, duration_ms, position, token):
+        started = time.perf_counter()
+
+        # 1. Caché en disco (memmap): reabrir un archivo no vuelve a decodificar
+        key = peak_cache.cache_key(media_path)
+        pyramid = peak_cache.load_pyramid(key) if key else None
+        if pyramid is not None:
+            if not self.set_pyramid(pyramid, token):
+                return
+            self._finish_speech(key, pyramid[0], token, store=True)
+
+            logging.info(
+                f"Picos cargados desde caché: {len(pyramid[0])} buckets en "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            if self.on_ready:
+                self.on_ready()
+            return
+
+        # 2. Cálculo progresivo en el pool de procesos
+        try:
+            pcm_wav = is_pcm_wav(media_path)
+            total = count_buckets(media_path, duration_ms, pcm_wav)
+        except Exception as e:
+            logging.warning(f"No se pudieron calcular los picos de '{media_path}': {e}")
+            self._mark_failed(token)
+            return
+        if total <= 0:
+            self._mark_failed(token)
+            return
+
+        chunk = WAV_CHUNK_BUCKETS if pcm_wav else TRANSCODE_CHUNK_BUCKETS
+        starts = list(range(0, total, chunk))
+        # Primero el trozo bajo la posición de reproducción, luego por cercanía
+        first = int(max(0.0, min(1.0, position)) * total) // chunk * chunk
+        starts.sort(key=lambda s: abs(s - first))
+
+        pyramid = build_pyramid(np.zeros((total, 3), dtype=np.float32))
+        with self._lock:
+            if token != self._token:
+                return
+            self._levels = self._make_levels(pyramid)
+            self._chunks_total = len(starts)
+            executor = get_executor()
+            for first_bucket in starts:
+                n_buckets = min(chunk, total - first_bucket)
+                future = executor.submit(compute_chunk_pyramid, media_path, first_bucket, n_buckets, pcm_wav)
+                future.add_done_callback(
+                    lambda f, fb=first_bucket: self._on_chunk_done(f, token, fb, key, media_path, started)
+                )
+                self._futures.append(future)
+
+    def _on_chunk_done(self, future, token, first_bucket, key, media_path, started):
+        if future.cancelled():
+            return
+
+        try:
+            chunk_levels = future.result()
+        except Exception as e:
+            logging.warning(f"Fallo al calcular un trozo de picos de '{media_path}': {e}")
+            chunk_levels = None
+
+        with self._lock:
+            if token != self._token:
+                return
+
+            if chunk_levels is not None:
+                for index, (level, values) in enumerate(zip(self._levels, chunk_levels)):
+                    offset = first_bucket // PYRAMID_FACTOR ** index
+                    count = max(0, min(len(values), len(level.peaks) - offset))
+                    level.peaks[offset:offset + count] = values[:count]
+                    level.envelope[offset:offset + count] = self._envelope_of(values[:count])
+
+                # Normalización global por el máximo conocido hasta ahora: si un
+                # trozo posterior trae un pico mayor, lo ya dibujado se reescala
+                # (una vez por pico nuevo, nunca al hacer zoom o desplazarse)
+                self._peak_max = max(self._peak_max, float(self._envelope_of(chunk_levels[-1]).max(initial=0.0)))
+                self._scale = 1.0 / self._peak_max if self._peak_max > 1e-6 else 1.0
+            else:
+                self._chunks_failed += 1
+
+            self._chunks_done += 1
+            self.version += 1
+            complete = self._chunks_done >= self._chunks_total
+            pyramid = [level.peaks for level in self._levels] if complete else None
+            failed = self._chunks_failed
+            decoded = complete and failed < self._chunks_total
+            if complete and not decoded:
+                self._failed = True     # Ningún trozo se pudo decodificar
+
+        if decoded:
+            logging.info(
+                f"Picos calculados: {len(pyramid[0])} buckets en "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            # Nunca cachear una pirámide con huecos
+            if key and not failed:
+                peak_cache.store_pyramid(key, media_path, pyramid)
+            self._finish_speech(key, pyramid[0], token, store=not failed)
+
+        if self.on_ready:
+            self.on_ready()
+
+    def _finish_speech(self, key, base, token, store):
+        """Índice de voz: desde la caché o calculado a partir del RMS del nivel base."""
+        from core.speech_index import compute_speech_intervals  # evita import circular
+
+        intervals = peak_cache.load_speech(key) if key else None
+        if intervals is None:
+            intervals = compute_speech_intervals(base)
+            if key and store:
+                peak_cache.store_speech(key, intervals)
+
+        with self._lock:
+            if token == self._token:
+                self._speech = intervals
+
+    def _make_levels(self, pyramid):
+        levels = []
+        for index, peaks in enumerate(pyramid):
+            spb = BASE_SAMPLES_PER_BUCKET * PYRAMID_FACTOR ** index
+            levels.append(_PeakLevel(spb, peaks, self._envelope_of(peaks)))
+        return levels
+
+    @staticmethod
+    def _envelope_of(peaks):
+        return np.maximum(np.abs(peaks[:, PEAK_MIN]), np.abs(peaks[:, PEAK_MAX]))
+
+    @staticmethod
+    def _scale_for(envelope):
+        norm = float(envelope.max(initial=0.0))
+        return 1.0 / norm if norm > 1e-6 else 1.0
@@ -1,13 +1,18 @@
-import math
-import random
+import numpy as np
 
 
 class WaveformSimulator:
     def __init__(self, total_points=50000):
         self.total_points = total_points
 
-        # Señal base (NO se regenera salvo reset duro)
-        self._base_data = self._generate()
+        # Señal base (NO se regenera salvo reset duro). Se genera de forma
+        # perezosa en el primer get_window para no pesar en el arranque.
+        self._base_data = None
+
+        # Buffer de salida reutilizable: get_window devuelve vistas de solo
+        # lectura sobre él, sin asignar memoria en régimen estable.
+        self._out = np.zeros(0, dtype=np.float32)
+        self._view = None
 
         # Energía visual dinámica
         self._energy = 1.0
@@ -18,21 +23,17 @@ class WaveformSimulator:
     # ---------------------------------------------------------
 
     def _generate(self):
-        data = []
-        phase = 0.0
-
-        for _ in range(self.total_points):
-            base = math.sin(phase) * 0.6
-            harmonic = math.sin(phase * 2.5) * 0.3
-            noise = random.uniform(-0.25, 0.25)
-
-            amp = base + harmonic + noise
-            amp = max(-1.0, min(1.0, amp))
+        """
+        Señal base vectorizada: float32 compacto en lugar de una lista de floats.
+        """
+        phase = np.arange(self.total_points, dtype=np.float32) * np.float32(0.035)
 
-            data.append(amp)
-            phase += 0.035
+        base = np.sin(phase) * 0.6
+        harmonic = np.sin(phase * 2.5) * 0.3
+        noise = np.random.uniform(-0.25, 0.25, self.total_points)
 
-        return data
+        amp = base + harmonic + noise
+        return np.clip(amp, -1.0, 1.0).astype(np.float32)
 
     # ---------------------------------------------------------
     # API PÚBLICA
@@ -41,7 +42,13 @@ class WaveformSimulator:
     def get_window(self, position: float, width: int):
         """
         Devuelve una ventana de amplitudes moduladas por energía.
+
+        El resultado es una vista de solo lectura sobre un buffer interno:
+        es válida hasta la siguiente llamada (copiarla si hay que guardarla).
         """
+        if self._base_data is None:
+            self._base_data = self._generate()
+
         position = max(0.0, min(1.0, position))
         center_index = int(position * self.total_points)
 
@@ -57,14 +64,28 @@ class WaveformSimulator:
             end = self.total_points
             start = end - window_size
 
-        window = self._base_data[start:end]
-
-        if len(window) < window_size:
-            window += [0.0] * (window_size - len(window))
+        window = self._base_data[max(0, start):end]
+        out = self._output_view(window_size)
 
-        # 🔥 aplicar energía dinámica
+        # 🔥 aplicar energía dinámica (multiplicación vectorizada sobre la vista)
         self._update_energy()
-        return [v * self._energy for v in window]
+        np.multiply(window, self._energy, out=self._out[:len(window)])
+        self._out[len(window):window_size] = 0.0
+        return out
+
+    def _output_view(self, width):
+        """
+        Vista de solo lectura de `width` elementos sobre el buffer de salida.
+        Se reutiliza mientras el ancho no cambie.
+        """
+        if self._view is not None and len(self._view) == width:
+            return self._view
+
+        if len(self._out) < width:
+            self._out = np.zeros(width, dtype=np.float32)
+        self._view = self._out[:width]
+        self._view.flags.writeable = False
+        return self._view
 
     # ---------------------------------------------------------
     # ENERGÍA VISUAL (CLAVE)
@@ -19,6 +19,9 @@ STRINGS = {
         "resuming_from_status": "Reanudando desde {minutes:02}:{seconds:02}...",
         "gain_label": "Ganancia (dB):",
         "volume_label": "Volumen:",
+        "skip_silence_label": "Saltar silencios",
+        "waveform_calculating": "Calculando forma de onda…",
+        "waveform_unavailable": "Forma de onda no disponible",
         "play_button": "Reproducir",
         "pause_button": "Pausar",
         "stop_button": "Detener",
@@ -81,6 +84,9 @@ STRINGS = {
         "resuming_from_status": "Resuming from {minutes:02}:{seconds:02}...",
         "gain_label": "Gain (dB):",
         "volume_label": "Volume:",
+        "skip_silence_label": "Skip silences",
+        "waveform_calculating": "Calculating waveform…",
+        "waveform_unavailable": "Waveform not available",
         "play_button": "Play",
         "pause_button": "Pause",
         "stop_button": "Stop",
@@ -143,6 +149,9 @@ STRINGS = {
         "resuming_from_status": "Reprise à {minutes:02}:{seconds:02}...",
         "gain_label": "Gain (dB):",
         "volume_label": "Volume:",
+        "skip_silence_label": "Sauter les silences",
+        "waveform_calculating": "Calcul de la forme d'onde…",
+        "waveform_unavailable": "Forme d'onde indisponible",
         "play_button": "Lire",
         "pause_button": "Pause",
         "stop_button": "Arrêter",
@@ -205,6 +214,9 @@ STRINGS = {
         "resuming_from_status": "Fortsetzen ab {minutes:02}:{seconds:02}...",
         "gain_label": "Verstärkung (dB):",
         "volume_label": "Lautstärke:",
+        "skip_silence_label": "Stille überspringen",
+        "waveform_calculating": "Wellenform wird berechnet…",
+        "waveform_unavailable": "Wellenform nicht verfügbar",
         "play_button": "Abspielen",
         "pause_button": "Pause",
         "stop_button": "Stopp",
@@ -267,6 +279,9 @@ STRINGS = {
         "resuming_from_status": "Retomando de {minutes:02}:{seconds:02}...",
         "gain_label": "Ganho (dB):",
         "volume_label": "Volume:",
+        "skip_silence_label": "Pular silêncios",
+        "waveform_calculating": "Calculando forma de onda…",
+        "waveform_unavailable": "Forma de onda indisponível",
         "play_button": "Reproduzir",
         "pause_button": "Pausar",
         "stop_button": "Parar",
@@ -329,6 +344,9 @@ STRINGS = {
         "resuming_from_status": "Riprendendo da {minutes:02}:{seconds:02}...",
         "gain_label": "Guadagno (dB):",
         "volume_label": "Volume:",
+        "skip_silence_label": "Salta silenzi",
+        "waveform_calculating": "Calcolo della forma d'onda…",
+        "waveform_unavailable": "Forma d'onda non disponibile",
         "play_button": "Riproduci",
         "pause_button": "Pausa",
         "stop_button": "Ferma",
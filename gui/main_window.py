@@ -13,9 +13,14 @@ from gui.progress_bar import ProgressCanvas
 from gui.audio_placeholder import AudioPlaceholder
 from core.player import Player, PlayerState
 from core.image_manager import ImageManager
+from core import peak_cache
 from core.playback_state import PlaybackState
-from core.waveform_simulator import WaveformSimulator
+from core.playback_clock import PlaybackClock
+from core.waveform_peaks import WaveformPeaks, shutdown_executor
 from gui.waveform_canvas import WaveformCanvas
+from core.spectrogram import SpectrogramTiles
+from core.speech_index import SpeechIndex
+from gui.spectrogram_canvas import SpectrogramCanvas
 from gui.i18n import tr # Add this import
 from core.audio_engine import AudioEngine
 from core.utils import resource_path # Importar resource_path
@@ -38,15 +43,35 @@ class MainWindow(ttk.Frame):
         self._seek_target_ms = 0  # Variable para el seek continuo
         self._has_resumed_playback = False # Flag para la reanudación única
         self._should_reset_audio_controls = False # Flag para resetear controles de audio
+        self._show_spectrogram = False # Vista de audio: waveform o espectrograma (clic derecho)
+        self._speech_index_sent = False # Índice de voz ya entregado al player para este medio
+        self._peaks_duration_ms = 0
+        self.playback_clock = PlaybackClock() # Posición extrapolada entre avisos del player
+        self._clock_after_id = None
+        self._last_time_label_s = None
 
         self.image_manager = ImageManager(scale_factor)
-        self.playback_state = PlaybackState() # Instanciar PlaybackState PRIMERO
-        self.waveform_simulator = WaveformSimulator() # Instanciar WaveformSimulator
+        self.playback_state = PlaybackState( # Instanciar PlaybackState PRIMERO
+            backend=settings.PLAYBACK_STATE_BACKEND,
+            max_age_days=settings.PLAYBACK_HISTORY_MAX_DAYS,
+            max_entries=settings.PLAYBACK_HISTORY_MAX_ENTRIES,
+        )
+        # Picos reales del audio; el canvas avisa mientras se calculan
+        self.waveform_peaks = WaveformPeaks(on_ready=self._on_waveform_peaks_ready)
+        self.spectrogram_tiles = SpectrogramTiles(on_ready=self._on_spectrogram_tile_ready)
+        # Recorre el disco: en un hilo aparte, como la poda del historial
+        threading.Thread(
+            target=peak_cache.prune,
+            args=(settings.WAVEFORM_CACHE_MAX_MB * 1024 ** 2, settings.WAVEFORM_CACHE_MAX_DAYS),
+            name="PeakCachePrune", daemon=True
+        ).start()
         self.player = Player(parent,
                              self.playback_state, # Pasarlo al player
                              on_state_change=self._on_player_state_change,
                              on_time_changed=self._on_player_time_changed,
-                             on_media_parsed=self._on_media_parsed)
+                             on_media_parsed=self._on_media_parsed,
+                             on_media_loaded=self._on_media_loaded,
+                             on_media_switched=self._on_media_switched)
         self.audio_engine = AudioEngine(self.player)
         self.current_media_path = None # Para rastrear el archivo actual
 
@@ -60,6 +85,7 @@ class MainWindow(ttk.Frame):
             self.ipc_listener_thread.start()
 
         self.parent.protocol("WM_DELETE_WINDOW", self._on_closing)
+        self.parent.bind("<Control-n>", self._load_next_in_folder)
         self.parent.after(100, lambda: self.player.set_drawable(self.video_frame.winfo_id()))
         self.parent.after(150, lambda: self._on_player_state_change(self.player.get_state()))
 
@@ -71,6 +97,92 @@ class MainWindow(ttk.Frame):
         logging.info("Media parsed, updating display.")
         self._update_media_display()
 
+    def _on_media_loaded(self, media_path, duration_ms):
+        """
+        Callback al terminar Player._handle_load. Los picos del waveform se
+        calculan en segundo plano empezando por la posición que se va a reanudar.
+        """
+        self.spectrogram_canvas.clear()
+        self._speech_index_sent = False
+        self._peaks_duration_ms = duration_ms
+        if self.playback_state.has_video:
+            self.waveform_peaks.clear()
+            self.spectrogram_tiles.clear()
+            return
+
+        # El espectrograma solo calcula tiles cuando se muestran
+        self.spectrogram_tiles.load(media_path, duration_ms)
+
+        position = 0.0
+        saved_position_ms = self.playback_state.get_position(media_path)
+        if saved_position_ms and duration_ms > 0:
+            position = saved_position_ms / duration_ms
+        self.waveform_peaks.load(media_path, duration_ms, position)
+
+    def _on_media_switched(self, media_path):
+        """
+        El player ha pasado por su cuenta al siguiente archivo de la carpeta
+        (precargado o no): reflejarlo en la UI como una carga nueva.
+        """
+        self.current_media_path = media_path
+        self._has_resumed_playback = False
+        self._reset_playback_ui()
+        self._reset_audio_controls_to_default() # Igual que al soltar un archivo nuevo
+        self.status_label.config(text=tr("loading_file_status", filename=os.path.basename(media_path)))
+
+        # Las vistas del archivo anterior no deben quedarse hasta _on_media_loaded
+        self._speech_index_sent = False
+        self.waveform_peaks.clear()
+        self.spectrogram_tiles.clear()
+        self.spectrogram_canvas.clear()
+        self.waveform_canvas.redraw()
+
+    def _load_next_in_folder(self, event=None):
+        if not self.current_media_path or self.player.get_state() in [PlayerState.NO_MEDIA, PlayerState.LOADING]:
+            return
+        if settings.REMEMBER_PLAYBACK_POSITION and self._total_duration_ms > 0:
+            self.playback_state.save_position(self.current_media_path, self._current_time_ms, self._total_duration_ms)
+        self.player.load_next()
+
+    def _on_waveform_peaks_ready(self):
+        """
+        Llamado desde los hilos de cálculo (cada trozo): redibujar en el hilo de Tk.
+        """
+        self.parent.after_idle(self.waveform_canvas.redraw)
+        self.parent.after_idle(self._send_speech_index)
+
+    def _send_speech_index(self):
+        """
+        Con los picos completos, entregar al player el índice de voz
+        (una vez por medio) para el modo de saltar silencios.
+        """
+        if self._speech_index_sent or not self.waveform_peaks.is_complete():
+            return
+        intervals = self.waveform_peaks.get_speech_intervals()
+        total_buckets = self.waveform_peaks.total_buckets()
+        if intervals is None or total_buckets == 0 or self._peaks_duration_ms <= 0:
+            return
+
+        self._speech_index_sent = True
+        index = SpeechIndex.from_buckets(intervals, total_buckets, self._peaks_duration_ms)
+        logging.info(f"Índice de voz: {len(index)} tramos")
+        self.player.set_speech_index(index)
+
+    def _on_skip_silence_toggled(self):
+        self.player.set_skip_silence(self.skip_silence_var.get(), settings.SKIP_SILENCE_MIN_MS)
+
+    def _on_spectrogram_tile_ready(self):
+        """
+        Llamado desde el pool al terminar un tile: redibujar en el hilo de Tk.
+        """
+        self.parent.after_idle(self.spectrogram_canvas.redraw)
+
+    def _toggle_spectrogram(self, event=None):
+        self._show_spectrogram = not self._show_spectrogram
+        self._update_media_display()
+        active = self.spectrogram_canvas if self._show_spectrogram else self.waveform_canvas
+        self.parent.after_idle(active.redraw)
+
     def _ipc_listener(self):
         while True:
             try:
@@ -128,6 +240,8 @@ class MainWindow(ttk.Frame):
         style.configure("Main.TFrame", background=settings.COLOR_PRIMARY_BACKGROUND)
         style.configure("Controls.TFrame", background=settings.COLOR_PRIMARY_BACKGROUND)
         style.configure("TLabel", background=settings.COLOR_PRIMARY_BACKGROUND, foreground=settings.COLOR_PRIMARY_TEXT, font=settings.FONT_DEFAULT)
+        style.configure("TCheckbutton", background=settings.COLOR_PRIMARY_BACKGROUND, foreground=settings.COLOR_PRIMARY_TEXT, font=settings.FONT_DEFAULT)
+        style.map("TCheckbutton", background=[('active', settings.COLOR_PRIMARY_BACKGROUND)])
 
         # Configuración de la barra de decibelios (Scale)
         style.configure("Horizontal.TScale",
@@ -173,9 +287,16 @@ class MainWindow(ttk.Frame):
         self.audio_placeholder.grid(row=0, column=0, sticky="nsew") # Grid it initially, its visibility will be managed
 
         # Instanciar el WaveformCanvas
-        self.waveform_canvas = WaveformCanvas(self.video_frame, self.waveform_simulator) # Pass the simulator
+        self.waveform_canvas = WaveformCanvas(self.video_frame, self.waveform_peaks, # Picos reales
+                                              render_mode=settings.WAVEFORM_RENDER_MODE)
         self.waveform_canvas.grid(row=0, column=0, sticky="nsew") # Grid it, its visibility will be managed
 
+        # Espectrograma (alternativa al waveform para audio; clic derecho alterna)
+        self.spectrogram_canvas = SpectrogramCanvas(self.video_frame, self.spectrogram_tiles)
+        self.spectrogram_canvas.grid(row=0, column=0, sticky="nsew")
+        self.waveform_canvas.bind("<Button-3>", self._toggle_spectrogram)
+        self.spectrogram_canvas.bind("<Button-3>", self._toggle_spectrogram)
+
         # Crear la etiqueta de 'arrastrar y soltar' una sola vez
         self.drop_message_label = tk.Label(self.video_frame, text=tr("drag_drop_message"), font=settings.FONT_BOLD, bg=settings.COLOR_VIDEO_BACKGROUND, fg=settings.COLOR_PRIMARY_TEXT)
         self.drop_message_label.grid(row=0, column=0, sticky="nsew") # Grid it, its visibility will be managed
@@ -183,6 +304,7 @@ class MainWindow(ttk.Frame):
         # Initial state: hide placeholder and waveform, show drop message
         self.audio_placeholder.grid_remove()
         self.waveform_canvas.grid_remove()
+        self.spectrogram_canvas.grid_remove()
 
 
         self.progress_bar = ProgressCanvas(main_frame,
@@ -205,6 +327,10 @@ class MainWindow(ttk.Frame):
         self.status_label.pack(side='top', anchor='w', padx=5)
         self.time_label = ttk.Label(info_frame, text="00:00 / 00:00", font=settings.FONT_DEFAULT, width=15)
         self.time_label.pack(side='top', anchor='w', padx=5)
+        self.skip_silence_var = tk.BooleanVar(value=settings.SKIP_SILENCE_ENABLED)
+        self.skip_silence_check = ttk.Checkbutton(info_frame, text=tr("skip_silence_label"), variable=self.skip_silence_var, command=self._on_skip_silence_toggled)
+        self.skip_silence_check.pack(side='top', anchor='w', padx=5)
+        self._on_skip_silence_toggled()
 
         gain_frame = ttk.Frame(controls_frame, style="Controls.TFrame")
         gain_frame.grid(row=0, column=2, sticky='e', padx=(10, 0))
@@ -351,6 +477,7 @@ class MainWindow(ttk.Frame):
         if self._total_duration_ms > 0:
             new_position = self._seek_target_ms / self._total_duration_ms
             self.player.set_position(new_position)
+            self.playback_clock.seek(self._seek_target_ms)
 
     def _stop_continuous_seek(self):
         if self._seeking_after_id:
@@ -380,6 +507,11 @@ class MainWindow(ttk.Frame):
                 else:
                     self._has_resumed_playback = True
         
+        if state == PlayerState.PLAYING:
+            self._start_playback_clock()
+        else:
+            self._stop_playback_clock()
+
         if state == PlayerState.PLAYING:
             self.status_label.config(text=tr("playing_status"))
             self._update_button(self.play_pause_button, tr("pause_button"))
@@ -408,7 +540,8 @@ class MainWindow(ttk.Frame):
             self._enable_controls(for_playback=False)
             self._send_ipc_message({"status": "media_unloaded"})
             self.audio_placeholder.reset()
-            self.waveform_simulator.reset_energy(soft=False)
+            self.waveform_peaks.clear()
+            self.spectrogram_tiles.clear()
             self._update_media_display()
             if settings.REMEMBER_PLAYBACK_POSITION and self.current_media_path:
                 current_position = self._current_time_ms
@@ -424,7 +557,6 @@ class MainWindow(ttk.Frame):
             self.status_label.config(text=tr("finished_status"))
             self._update_button(self.play_pause_button, tr("play_button"))
             self.progress_bar.set_progress(self._total_duration_ms, self._total_duration_ms)
-            self.waveform_simulator.reset_energy(soft=True)
             self._reset_audio_controls_to_default() # Reset on finish
 
         elif state in [PlayerState.NO_MEDIA, PlayerState.ERROR]:
@@ -435,32 +567,69 @@ class MainWindow(ttk.Frame):
             self._disable_all_controls()
             self._send_ipc_message({"status": "media_unloaded"})
             self.audio_placeholder.reset()
-            self.waveform_simulator.reset_energy(soft=False)
+            self.waveform_peaks.clear()
+            self.spectrogram_tiles.clear()
             self._update_media_display()
             self._reset_audio_controls_to_default() # Reset on no media or error
         elif state == PlayerState.LOADING:
             self.status_label.config(text=tr("loading_status"))
             self._disable_all_controls()
 
-    def _on_player_time_changed(self, current_time_ms, total_time_ms):
+    def _on_player_time_changed(self, current_time_ms, total_time_ms, sampled_at=None):
         if self._is_user_seeking:
             return
             
         self._total_duration_ms = total_time_ms
         self._current_time_ms = current_time_ms
-        if not self._is_user_seeking:
-            self.progress_bar.set_progress(current_time_ms, total_time_ms)
+        # La muestra solo re-ancla el reloj; durante la reproducción dibuja _clock_tick
+        self.playback_clock.sample(current_time_ms, total_time_ms, sampled_at)
+        if not self.playback_clock.running:
+            self._render_playback_position(current_time_ms, total_time_ms)
+
+    def _render_playback_position(self, current_time_ms, total_time_ms):
+        self.progress_bar.set_progress(current_time_ms, total_time_ms)
         
         # Calculate playback_position for the waveform canvas
         playback_position = 0.0
         if total_time_ms > 0:
             playback_position = current_time_ms / total_time_ms
 
-        self.waveform_canvas.set_playback_position(playback_position) # Update this line
-
+        # Con vídeo los lienzos están ocultos (grid_remove): no redibujar a 60 fps
+        if not self.playback_state.has_video:
+            if self._show_spectrogram:
+                self.spectrogram_canvas.set_playback_position(playback_position)
+            else:
+                self.waveform_canvas.set_playback_position(playback_position) # Update this line
 
+        # La etiqueta solo cambia una vez por segundo
         current_s, total_s = current_time_ms // 1000, total_time_ms // 1000
-        self.time_label.config(text=f"{divmod(current_s,60)[0]:02}:{divmod(current_s,60)[1]:02} / {divmod(total_s,60)[0]:02}:{divmod(total_s,60)[1]:02}")
+        if (current_s, total_s) != self._last_time_label_s:
+            self._last_time_label_s = (current_s, total_s)
+            self.time_label.config(text=f"{divmod(current_s,60)[0]:02}:{divmod(current_s,60)[1]:02} / {divmod(total_s,60)[0]:02}:{divmod(total_s,60)[1]:02}")
+
+    def _start_playback_clock(self):
+        self.playback_clock.start()
+        if self._clock_after_id is None:
+            self._clock_tick()
+
+    def _stop_playback_clock(self):
+        self.playback_clock.stop()
+        if self._clock_after_id is not None:
+            self.parent.after_cancel(self._clock_after_id)
+            self._clock_after_id = None
+
+    def _clock_tick(self):
+        """
+        Dibuja la posición extrapolada a la cadencia de pantalla mientras se
+        reproduce; no hace ninguna llamada a libVLC.
+        """
+        self._clock_after_id = None
+        if not self.playback_clock.running:
+            return
+        if not self._is_user_seeking and self._total_duration_ms > 0:
+            self._current_time_ms = self.playback_clock.now_ms()
+            self._render_playback_position(self._current_time_ms, self._total_duration_ms)
+        self._clock_after_id = self.parent.after(max(1, 1000 // settings.PLAYBACK_UI_FPS), self._clock_tick)
 
     def _on_progress_seek(self, time_ms: int):
         if self.player.get_state() not in [PlayerState.PLAYING, PlayerState.PAUSED]: return
@@ -470,14 +639,18 @@ class MainWindow(ttk.Frame):
         
         new_position = time_ms / self._total_duration_ms
         self.player.set_position(new_position)
+        self.playback_clock.seek(time_ms)
         
         self.progress_bar.set_progress(time_ms, self._total_duration_ms)
         
         self.parent.after(150, lambda: setattr(self, '_is_user_seeking', False))
 
     def _reset_playback_ui(self):
+        self._stop_playback_clock()
+        self.playback_clock.reset()
         self.progress_bar.reset()
         self.time_label.config(text="00:00 / 00:00")
+        self._last_time_label_s = None
         self._total_duration_ms = 0
 
     def _reset_audio_controls_to_default(self):
@@ -498,6 +671,7 @@ class MainWindow(ttk.Frame):
         self.audio_placeholder.grid_remove()
         self.drop_message_label.grid_remove()
         self.waveform_canvas.grid_remove() # Ocultar también el waveform canvas
+        self.spectrogram_canvas.grid_remove()
 
         current_state = self.player.get_state()
 
@@ -507,6 +681,8 @@ class MainWindow(ttk.Frame):
         elif self.playback_state.has_video:
             # Para vídeo, no mostramos ningún widget sobre el frame. VLC dibuja detrás.
             pass
+        elif self._show_spectrogram: # Solo audio, vista de espectrograma
+            self.spectrogram_canvas.grid(row=0, column=0, sticky="nsew")
         else: # Es solo audio y está cargado (PLAYING o PAUSED)
             self.waveform_canvas.grid(row=0, column=0, sticky="nsew") # Mostrar waveform para audio
 
@@ -545,4 +721,6 @@ class MainWindow(ttk.Frame):
         self._send_ipc_message({"status": "ui_closing"})
         time.sleep(0.2)
         self.player.release()
+        self.playback_state.flush() # Volcado final del write-behind
+        shutdown_executor()
         self.parent.quit()
@@ -0,0 +1,120 @@
+import tkinter as tk
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+from core.spectrogram import TILE_COLUMNS
+from core.waveform_peaks import BASE_SAMPLES_PER_BUCKET, DEFAULT_SAMPLES_PER_PIXEL
+from gui.waveform_canvas import MIN_SAMPLES_PER_PIXEL, MAX_SAMPLES_PER_PIXEL
+
+# Tiles ya escalados a la resolución de pantalla (LRU). Como mínimo; la
+# capacidad real crece con los tiles visibles para que redibujar la misma
+# vista (60 fps) nunca vuelva a decodificar ni escalar.
+SCALED_TILE_CACHE_SIZE = 24
+
+
+class SpectrogramCanvas(tk.Canvas):
+    """
+    Vista de espectrograma para medios solo audio.
+
+    Misma geometría y zoom que WaveformCanvas: compone los tiles visibles
+    (ya escalados y cacheados) en un único PhotoImage por frame.
+    """
+
+    def __init__(self, parent, tiles, **kwargs):
+        super().__init__(
+            parent,
+            bg="#0B2A3A",          # fondo acorde a tu UI
+            highlightthickness=0,
+            bd=0,
+            **kwargs
+        )
+
+        self.tiles = tiles
+        self.playback_position = 0.0
+        self.samples_per_pixel = DEFAULT_SAMPLES_PER_PIXEL
+
+        self._image_id = None
+        self._photo = None
+        self._scaled = OrderedDict()   # (índice, zoom, alto) -> Image
+        self._scaled_capacity = SCALED_TILE_CACHE_SIZE
+
+        # Zoom con la rueda del ratón (Windows / X11)
+        self.bind("<MouseWheel>", lambda e: self.zoom(0.5 if e.delta > 0 else 2.0))
+        self.bind("<Button-4>", lambda e: self.zoom(0.5))
+        self.bind("<Button-5>", lambda e: self.zoom(2.0))
+
+    def set_playback_position(self, position: float):
+        self.playback_position = position
+        self.redraw()
+
+    def zoom(self, factor: float):
+        spp = int(self.samples_per_pixel * factor)
+        self.samples_per_pixel = max(MIN_SAMPLES_PER_PIXEL, min(MAX_SAMPLES_PER_PIXEL, spp))
+        self.redraw()
+
+    def clear(self):
+        self._scaled.clear()
+        if self._image_id is not None:
+            self.itemconfigure(self._image_id, state="hidden")
+
+    def redraw(self):
+        w = self.winfo_width()
+        h = self.winfo_height()
+        if w <= 1 or h <= 1 or not self.tiles.is_ready():
+            return
+
+        spp = self.samples_per_pixel
+        tile_px = max(1, TILE_COLUMNS * BASE_SAMPLES_PER_BUCKET // spp)
+        total_px = self.tiles.total_columns * BASE_SAMPLES_PER_BUCKET // spp
+        start = self._window_start(total_px, w)
+
+        first, last = start // tile_px, (start + w - 1) // tile_px
+        visible = last - first + 1
+        # Vista actual + una de margen; los tiles escalados son pequeños
+        # (tile_px · alto), así que el total queda acotado por ~2 anchos
+        self._scaled_capacity = max(SCALED_TILE_CACHE_SIZE, 2 * visible + 2)
+        self.tiles.reserve(visible + 2)
+
+        strip = Image.new("RGB", (w, h), self["bg"])
+        for index in range(first, last + 1):
+            tile = self._get_scaled_tile(index, spp, tile_px, h)
+            if tile is not None:
+                strip.paste(tile, (index * tile_px - start, 0))
+
+        if self._photo is None or self._photo.width() != w or self._photo.height() != h:
+            self._photo = ImageTk.PhotoImage(strip)
+            if self._image_id is None:
+                self._image_id = self.create_image(0, 0, image=self._photo, anchor="nw")
+            else:
+                self.itemconfigure(self._image_id, image=self._photo)
+        else:
+            self._photo.paste(strip)
+        self.itemconfigure(self._image_id, state="normal")
+
+    def _window_start(self, total_px, width):
+        """Misma geometría de ventana que WaveformSimulator / WaveformPeaks."""
+        position = max(0.0, min(1.0, self.playback_position))
+        start = int(position * total_px) - width // 4
+        if start < 0:
+            start = 0
+        if start + width > total_px:
+            start = max(0, total_px - width)
+        return start
+
+    def _get_scaled_tile(self, index, spp, tile_px, h):
+        key = (index, spp, h)
+        scaled = self._scaled.get(key)
+        if scaled is not None:
+            self._scaled.move_to_end(key)
+            return scaled
+
+        tile = self.tiles.get_tile(index)
+        if tile is None:
+            return None  # Calculándose: on_ready pedirá un redibujado
+
+        scaled = tile.resize((tile_px, h), Image.Resampling.BILINEAR)
+        self._scaled[key] = scaled
+        while len(self._scaled) > self._scaled_capacity:
+            self._scaled.popitem(last=False)
+        return scaled
@@ -1,8 +1,33 @@
+import logging
+import time
 import tkinter as tk
+from collections import OrderedDict
 
+import numpy as np
+from PIL import Image, ImageColor, ImageTk
+
+from config import settings
+from core.waveform_peaks import DEFAULT_SAMPLES_PER_PIXEL, STATUS_CALCULATING, STATUS_READY, STATUS_UNAVAILABLE
+from gui.i18n import tr
+
+
+# Límites del zoom (muestras por píxel a 8 kHz)
+MIN_SAMPLES_PER_PIXEL = 16
+MAX_SAMPLES_PER_PIXEL = 65536
+
+# Presupuesto por redibujado (ms). Medido como media móvil; si se supera,
+# se dibuja una de cada N columnas hasta volver a entrar en presupuesto.
+REDRAW_BUDGET_MS = 4.0
+MAX_COLUMN_STEP = 4
+
+# Modo raster: tiles de columnas pre-renderizadas con PIL y cacheadas (LRU)
+RENDER_VECTOR = "vector"
+RENDER_RASTER = "raster"
+TILE_WIDTH = 256
+TILE_CACHE_SIZE = 48
 
 class WaveformCanvas(tk.Canvas):
-    def __init__(self, parent, simulator, **kwargs):
+    def __init__(self, parent, simulator, render_mode=RENDER_VECTOR, **kwargs):
         super().__init__(
             parent,
             bg="#0B2A3A",          # fondo acorde a tu UI
@@ -12,53 +37,204 @@ class WaveformCanvas(tk.Canvas):
         )
 
         self.simulator = simulator
+        self.render_mode = render_mode
         self.playback_position = 0.0
+        self.samples_per_pixel = DEFAULT_SAMPLES_PER_PIXEL
 
         # Colores de tu paleta
         self.wave_color = "#00C8FF"
         self.wave_glow = "#4DDCFF"
 
+        # Modo retenido: un único polígono (relleno + contorno "glow") que se
+        # crea una vez y solo se actualiza con coords() en cada frame.
+        self._wave_id = None
+        self._column_step = 1
+        self.last_redraw_ms = 0.0
+        self.avg_redraw_ms = 0.0
+        self._last_budget_warning = 0.0
+
+        # Aviso "calculando / no disponible" mientras no hay picos reales
+        self._status_id = None
+        self._status_shown = None     # (estado, ancho, alto) dibujado
+
+        # Modo raster: un único item de imagen que se rellena con tiles
+        self._image_id = None
+        self._photo = None
+        self._tiles = OrderedDict()   # (versión, zoom, alto, índice) -> Image
+
+        # Zoom con la rueda del ratón (Windows / X11)
+        self.bind("<MouseWheel>", lambda e: self.zoom(0.5 if e.delta > 0 else 2.0))
+        self.bind("<Button-4>", lambda e: self.zoom(0.5))
+        self.bind("<Button-5>", lambda e: self.zoom(2.0))
+
     def set_playback_position(self, position: float):
         self.playback_position = position
         self.redraw()
 
+    def zoom(self, factor: float):
+        """
+        Multiplica las muestras por píxel (factor < 1 acerca, > 1 aleja).
+        """
+        spp = int(self.samples_per_pixel * factor)
+        self.samples_per_pixel = max(MIN_SAMPLES_PER_PIXEL, min(MAX_SAMPLES_PER_PIXEL, spp))
+        self.redraw()
+
     def redraw(self):
-        self.delete("wave")
+        started = time.perf_counter()
 
         w = self.winfo_width()
         h = self.winfo_height()
         if w <= 1 or h <= 1:
             return
 
+        status = self.simulator.status()
+        if self.render_mode == RENDER_RASTER and status == STATUS_READY:
+            self._redraw_raster(w, h)
+        else:
+            self._redraw_vector(w, h)
+        self._show_status(status, w, h)
+
+        self._account_redraw((time.perf_counter() - started) * 1000.0)
+
+    def _redraw_vector(self, w, h):
         center_y = h // 2
         max_height = int(h * 0.46)
+        step = self._column_step
 
         amplitudes = self.simulator.get_window(
             self.playback_position,
-            w
+            (w + step - 1) // step,
+            samples_per_pixel=self.samples_per_pixel * step
         )
 
-        for x, amp in enumerate(amplitudes):
-            bar = int(abs(amp) * max_height)
+        bars = (np.abs(np.asarray(amplitudes, dtype=np.float32)) * max_height).astype(np.int32)
+        xs = np.arange(len(bars), dtype=np.int32) * step
 
-            # Glow suave (profundidad)
-            self.create_line(
-                x,
-                center_y - bar - 1,
-                x,
-                center_y + bar + 1,
-                fill=self.wave_glow,
-                width=1,
-                tags="wave"
-            )
+        # Contorno del polígono: borde superior de izquierda a derecha y
+        # borde inferior de vuelta, como pares (x, y) aplanados.
+        points = np.empty((2 * len(bars), 2), dtype=np.int32)
+        points[:len(bars), 0] = xs
+        points[:len(bars), 1] = center_y - bars
+        points[len(bars):, 0] = xs[::-1]
+        points[len(bars):, 1] = (center_y + bars)[::-1]
+        coords = points.ravel().tolist()
 
-            # Barra principal
-            self.create_line(
-                x,
-                center_y - bar,
-                x,
-                center_y + bar,
+        if self._wave_id is None:
+            self._wave_id = self.create_polygon(
+                coords,
                 fill=self.wave_color,
+                outline=self.wave_glow,   # Glow suave (profundidad)
                 width=1,
                 tags="wave"
-            )
\ No newline at end of file
+            )
+        else:
+            self.coords(self._wave_id, coords)
+            self.itemconfigure(self._wave_id, state="normal")
+
+        if self._image_id is not None:
+            self.itemconfigure(self._image_id, state="hidden")
+
+    def _show_status(self, status, w, h):
+        """Texto centrado sobre la línea plana; solo toca el canvas si cambia."""
+        if (status, w, h) == self._status_shown:
+            return
+        self._status_shown = (status, w, h)
+
+        messages = {
+            STATUS_CALCULATING: tr("waveform_calculating"),
+            STATUS_UNAVAILABLE: tr("waveform_unavailable"),
+        }
+        text = messages.get(status)
+        if text is None:
+            if self._status_id is not None:
+                self.itemconfigure(self._status_id, state="hidden")
+            return
+        if self._status_id is None:
+            self._status_id = self.create_text(
+                w // 2, h // 2 - 14, text=text, fill=self.wave_glow,
+                font=settings.FONT_DEFAULT, tags="status"
+            )
+        else:
+            self.coords(self._status_id, w // 2, h // 2 - 14)
+            self.itemconfigure(self._status_id, text=text, state="normal")
+        self.tag_raise(self._status_id)
+
+    # ---------------------------------------------------------
+    # MODO RASTER
+    # ---------------------------------------------------------
+
+    def _redraw_raster(self, w, h):
+        """
+        Compone la ventana visible con tiles cacheados y la vuelca en un único
+        PhotoImage. Desplazar el cursor de reproducción solo re-compone tiles.
+        """
+        spp = self.samples_per_pixel
+        start = self.simulator.window_start(self.playback_position, w, spp)
+
+        strip = Image.new("RGB", (w, h), self["bg"])
+        for index in range(start // TILE_WIDTH, (start + w - 1) // TILE_WIDTH + 1):
+            strip.paste(self._get_tile(index, spp, h), (index * TILE_WIDTH - start, 0))
+
+        if self._photo is None or self._photo.width() != w or self._photo.height() != h:
+            self._photo = ImageTk.PhotoImage(strip)
+            if self._image_id is None:
+                self._image_id = self.create_image(0, 0, image=self._photo, anchor="nw", tags="wave")
+            else:
+                self.itemconfigure(self._image_id, image=self._photo)
+        else:
+            self._photo.paste(strip)
+
+        self.itemconfigure(self._image_id, state="normal")
+        if self._wave_id is not None:
+            self.itemconfigure(self._wave_id, state="hidden")
+
+    def _get_tile(self, index, spp, h):
+        key = (self.simulator.version, spp, h, index)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        tile = self._render_tile(index, spp, h)
+        self._tiles[key] = tile
+        if len(self._tiles) > TILE_CACHE_SIZE:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _render_tile(self, index, spp, h):
+        """Dibuja TILE_WIDTH columnas del waveform en una imagen RGB (vectorizado)."""
+        amplitudes = np.zeros(TILE_WIDTH, dtype=np.float32)
+        columns = self.simulator.get_columns(index * TILE_WIDTH, TILE_WIDTH, spp)
+        amplitudes[:len(columns)] = columns
+
+        center_y = h // 2
+        bars = (np.abs(amplitudes) * int(h * 0.46)).astype(np.int32)
+        distance = np.abs(np.arange(h, dtype=np.int32) - center_y)[:, None]
+
+        pixels = np.empty((h, TILE_WIDTH, 3), dtype=np.uint8)
+        pixels[:] = ImageColor.getrgb(self["bg"])
+        pixels[distance <= bars + 1] = ImageColor.getrgb(self.wave_glow)
+        pixels[distance <= bars] = ImageColor.getrgb(self.wave_color)
+        return Image.fromarray(pixels, "RGB")
+
+    def _account_redraw(self, elapsed_ms: float):
+        """
+        Mide el coste del frame y ajusta la densidad de columnas al presupuesto.
+        """
+        self.last_redraw_ms = elapsed_ms
+        self.avg_redraw_ms = elapsed_ms if not self.avg_redraw_ms else self.avg_redraw_ms * 0.9 + elapsed_ms * 0.1
+
+        if self.avg_redraw_ms > REDRAW_BUDGET_MS and self._column_step < MAX_COLUMN_STEP:
+            self._column_step += 1
+            self.avg_redraw_ms = 0.0
+        elif self.avg_redraw_ms < REDRAW_BUDGET_MS / 3 and self._column_step > 1:
+            self._column_step -= 1
+            self.avg_redraw_ms = 0.0
+
+        now = time.monotonic()
+        if self.avg_redraw_ms > REDRAW_BUDGET_MS and now - self._last_budget_warning > 10.0:
+            self._last_budget_warning = now
+            logging.warning(
+                f"Waveform fuera de presupuesto: {self.avg_redraw_ms:.1f} ms "
+                f"(límite {REDRAW_BUDGET_MS} ms, paso {self._column_step})"
+            )
@@ -34,6 +34,19 @@ FAST_SEEK_INTERVAL_MS = 5000 # Intervalo de salto rápido en milisegundos (5 seg
 
 # Configuración de reproducción
 REMEMBER_PLAYBACK_POSITION = True
+PLAYBACK_UI_FPS = 60 # Cadencia de la barra de progreso y el waveform (reloj extrapolado)
+PLAYBACK_STATE_BACKEND = "journal" # "journal" (JSON + diario) o "sqlite" (historiales grandes)
+PLAYBACK_HISTORY_MAX_DAYS = 365 # Olvidar posiciones no usadas en este tiempo (None = nunca)
+PLAYBACK_HISTORY_MAX_ENTRIES = 5000 # Máximo de archivos recordados; se olvidan los menos recientes
+
+# Waveform: "vector" (polígono retenido) o "raster" (tiles PIL cacheados)
+WAVEFORM_RENDER_MODE = "vector"
+WAVEFORM_CACHE_MAX_MB = 2048 # Tamaño máximo de config/waveform_cache (picos y espectrogramas)
+WAVEFORM_CACHE_MAX_DAYS = 90 # Olvidar cachés no usadas en este tiempo (None = nunca)
+
+# Saltar silencios: solo pausas más largas que esto (ms)
+SKIP_SILENCE_ENABLED = False
+SKIP_SILENCE_MIN_MS = 1500
 
 # Internacionalización
 DEFAULT_LANGUAGE = "es"
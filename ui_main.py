@@ -6,6 +6,7 @@ import time
 import logging
 import ctypes
 import os 
+import multiprocessing
 from multiprocessing.connection import Client
 import threading
 import queue
@@ -103,6 +104,8 @@ def main_ui():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos del waveform en el .exe de PyInstaller
+    multiprocessing.freeze_support()
     enable_dpi_awareness() # Asegúrate de que DPI awareness se active al inicio.
 
     if "--hotkey-server" in sys.argv: